@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import os
+import json
+import importlib
+import warnings
+
+import numpy as np
+
+from dotmap import DotMap
+from typing import Callable, Iterable, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.linear_model import LinearRegression
+
+from pluma.io.columnar import write_columnar, read_columnar
+from pluma.io.path_helper import ComplexPath, ensure_complexpath
+from pluma.stream import Stream
+from pluma.sync import ClockReference, ClockRefId
+
+_MANIFEST_FILE = "manifest.json"
+_STREAMS_FOLDER = "streams"
+_GEOREFERENCE_NAME = "georeference"
+_FORMAT_VERSION = 1
+
+_STREAM_ATTRIBUTES = (
+    "server_lsl_marker",
+    "positiondata",
+    "eeg_to_harp_model",
+    "buffer_index",
+    "clock_offset",
+)
+
+
+def export_dataset_to_columnar(
+    dataset,
+    outdir: Union[str, ComplexPath],
+    max_workers: Optional[int] = None,
+) -> dict:
+    """Exports all dataset streams to a folder with one columnar file per stream,
+    and a manifest describing the schema, clock models and georeference.
+
+    Args:
+        dataset (Dataset): Dataset to export.
+        outdir (Union[str, ComplexPath]): Output folder.
+        max_workers (Optional[int], optional): Maximum number of streams written\
+            concurrently. If None, it will default to the ThreadPoolExecutor default.
+
+    Returns:
+        dict: The manifest written to the output folder.
+    """
+    outdir = ensure_complexpath(outdir)
+    streams_dir = ensure_complexpath(outdir)
+    streams_dir.join(_STREAMS_FOLDER)
+    if not outdir.iss3f():
+        os.makedirs(streams_dir.path, exist_ok=True)
+
+    def _write_stream(item):
+        key, stream = item
+        entry = {
+            "class": _qualified_name(type(stream)),
+            "device": stream.device,
+            "streamlabel": stream.streamlabel,
+            "clockreference": _clockreference_to_dict(stream.clockreference),
+            "data": write_columnar(stream.data, streams_dir, key),
+            "attributes": {
+                name: write_columnar(getattr(stream, name), streams_dir, f"{key}.{name}")
+                for name in _STREAM_ATTRIBUTES
+                if getattr(stream, name, None) is not None
+            },
+        }
+        si_conversion = getattr(stream, "si_conversion", None)
+        if si_conversion is not None:
+            entry["is_si"] = si_conversion.is_si
+        return key, entry
+
+    stream_items = list(iter_stream_items(dataset.streams))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        streams = dict(executor.map(_write_stream, stream_items))
+
+    georeference = dataset.georeference
+    spacetime = georeference.spacetime
+    manifest = {
+        "format": "pluma-columnar",
+        "version": _FORMAT_VERSION,
+        "datasetlabel": dataset.datasetlabel,
+        "rootfolder": dataset.rootfolder.path,
+        "schema": _qualified_name(dataset.schema),
+        "has_calibration": dataset.has_calibration,
+        "georeference": {
+            "clockreference": _clockreference_to_dict(georeference.clockreference),
+            "data": write_columnar(
+                None if spacetime is None else spacetime.drop(columns="geometry", errors="ignore"),
+                outdir,
+                _GEOREFERENCE_NAME,
+            ),
+        },
+        "streams": streams,
+    }
+
+    path = ensure_complexpath(outdir)
+    path.join(_MANIFEST_FILE)
+    with path.open("w") as stream:
+        json.dump(manifest, stream, indent=2)
+    return manifest
+
+
+def read_columnar_manifest(path: Union[str, ComplexPath]) -> dict:
+    """Reads the manifest of a dataset exported with export_dataset_to_columnar.
+
+    Args:
+        path (Union[str, ComplexPath]): Folder containing the exported dataset.
+
+    Returns:
+        dict: The dataset manifest.
+    """
+    path = ensure_complexpath(path)
+    path.join(_MANIFEST_FILE)
+    with path.open("r") as stream:
+        manifest = json.load(stream)
+    if manifest.get("format") != "pluma-columnar":
+        raise ValueError(f"{path} is not a valid columnar dataset manifest.")
+    return manifest
+
+
+def load_columnar_stream(path: Union[str, ComplexPath], key: str, memory_map: bool = True):
+    """Loads the data of a single stream from a dataset exported with export_dataset_to_columnar,
+    without reading any other stream.
+
+    Args:
+        path (Union[str, ComplexPath]): Folder containing the exported dataset.
+        key (str): Dot separated stream key in the dataset schema, e.g. 'BioData.Set'.
+        memory_map (bool, optional): If True, local files are memory-mapped. Defaults to True.
+
+    Returns:
+        Any: The stream data.
+    """
+    manifest = read_columnar_manifest(path)
+    if key not in manifest["streams"]:
+        raise KeyError(f"Stream {key} was not found in the exported dataset.")
+    streams_dir = ensure_complexpath(path)
+    streams_dir.join(_STREAMS_FOLDER)
+    return read_columnar(manifest["streams"][key]["data"], streams_dir, memory_map=memory_map)
+
+
+def load_columnar_georeference(path: Union[str, ComplexPath], memory_map: bool = True):
+    """Loads the georeference of a dataset exported with export_dataset_to_columnar,
+    without reading any stream.
+
+    Args:
+        path (Union[str, ComplexPath]): Folder containing the exported dataset.
+        memory_map (bool, optional): If True, local files are memory-mapped. Defaults to True.
+
+    Returns:
+        Optional[pd.DataFrame]: The georeference spacetime, without geometry.
+    """
+    manifest = read_columnar_manifest(path)
+    return read_columnar(manifest["georeference"]["data"], path, memory_map=memory_map)
+
+
+def restore_columnar_dataset(
+    dataset,
+    path: Union[str, ComplexPath],
+    streams: Optional[Iterable[str]] = None,
+    memory_map: bool = True,
+) -> None:
+    """Populates a dataset with the streams, clock models and georeference
+    of a dataset exported with export_dataset_to_columnar.
+
+    Args:
+        dataset (Dataset): Dataset to populate. Its schema must be compatible with the exported schema.
+        path (Union[str, ComplexPath]): Folder containing the exported dataset.
+        streams (Optional[Iterable[str]], optional): Keys of the streams to load.\
+            If None, all exported streams are loaded. Defaults to None.
+        memory_map (bool, optional): If True, local files are memory-mapped. Defaults to True.
+    """
+    manifest = read_columnar_manifest(path)
+    streams_dir = ensure_complexpath(path)
+    streams_dir.join(_STREAMS_FOLDER)
+
+    if dataset.streams is None:
+        dataset.populate_streams(autoload=False)
+
+    keys = manifest["streams"].keys() if streams is None else streams
+    for key in keys:
+        entry = manifest["streams"][key]
+        stream = get_stream(dataset.streams, key)
+        if stream is None:
+            warnings.warn(f"Stream {key} was not found in the dataset schema.")
+            continue
+        stream.data = read_columnar(entry["data"], streams_dir, memory_map=memory_map)
+        for name, value in entry["attributes"].items():
+            setattr(stream, name, read_columnar(value, streams_dir, memory_map=memory_map))
+        if "is_si" in entry:
+            stream.si_conversion.is_si = entry["is_si"]
+        stream.clockreference = _clockreference_from_dict(entry["clockreference"])
+
+    georeference = manifest["georeference"]
+    spacetime = read_columnar(georeference["data"], path, memory_map=memory_map)
+    if spacetime is not None:
+        dataset.georeference.from_dataframe(spacetime.copy())
+    dataset.georeference.clockreference = _clockreference_from_dict(georeference["clockreference"])
+    dataset.has_calibration = manifest["has_calibration"]
+
+
+def resolve_qualified_name(name: str) -> Callable:
+    """Imports an object from its 'module:qualname' name."""
+    module, _, qualname = name.partition(":")
+    obj = importlib.import_module(module)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def iter_stream_items(schema: Union[DotMap, Stream], prefix: str = ""):
+    """Recursively yields (key, stream) pairs from a stream schema,
+    where key is the dot separated path of the stream in the schema."""
+    if isinstance(schema, Stream):
+        yield prefix, schema
+    elif isinstance(schema, DotMap):
+        for key, value in schema.items():
+            yield from iter_stream_items(value, f"{prefix}.{key}" if prefix else key)
+    else:
+        raise TypeError(f"Invalid type was found. Must be of {Union[DotMap, Stream]}")
+
+
+def get_stream(schema: DotMap, key: str) -> Optional[Stream]:
+    """Returns the stream at the dot separated key of a stream schema, or None if not found."""
+    node = schema
+    for part in key.split("."):
+        if not isinstance(node, DotMap) or part not in node:
+            return None
+        node = node[part]
+    return node if isinstance(node, Stream) else None
+
+
+def _qualified_name(obj) -> str:
+    if obj.__qualname__ != obj.__name__ or obj.__name__ == "<lambda>":
+        raise ValueError(f"{obj} must be defined at module level to be exported.")
+    return f"{obj.__module__}:{obj.__qualname__}"
+
+
+def _clockreference_to_dict(clockreference: ClockReference) -> dict:
+    model = None
+    conversion_model = clockreference.conversion_model
+    if conversion_model is not None:
+        regression = getattr(conversion_model, "__self__", None)
+        if isinstance(regression, LinearRegression):
+            model = {
+                "coef": np.asarray(regression.coef_).tolist(),
+                "intercept": np.asarray(regression.intercept_).tolist(),
+            }
+        else:
+            warnings.warn(f"Clock conversion model {conversion_model} cannot be exported.")
+    return {
+        "referenceid": clockreference.referenceid.value,
+        "history": [x.value for x in clockreference._referenceid_history],
+        "reference_to": clockreference.reference_to.value,
+        "reference_from": clockreference.reference_from.value,
+        "model": model,
+    }
+
+
+def _clockreference_from_dict(value: dict) -> ClockReference:
+    clockreference = ClockReference(referenceid=ClockRefId(value["referenceid"]))
+    clockreference._referenceid_history = [ClockRefId(x) for x in value["history"]]
+    clockreference.reference_to = ClockRefId(value["reference_to"])
+    clockreference.reference_from = ClockRefId(value["reference_from"])
+    if value["model"] is not None:
+        regression = LinearRegression()
+        regression.coef_ = np.asarray(value["model"]["coef"])
+        regression.intercept_ = np.asarray(value["model"]["intercept"])
+        regression.n_features_in_ = regression.coef_.shape[-1]
+        clockreference.conversion_model = regression
+    return clockreference
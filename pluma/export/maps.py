@@ -5,10 +5,14 @@ import numpy as np
 
 import pandas as pd
 import geopandas as gpd
+import shapely
 import simplekml
 
+from typing import Optional
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
+from pluma.preprocessing.spatial import simplify_lonlat
+
 
 def showmap(
     path,
@@ -21,6 +25,7 @@ def showmap(
     tiles=tmb.tiles.build_OSM(),
     cmap="jet",
     markersize=15,
+    decimate=True,
     **cbarkwargs,
 ):
     if fig is None:
@@ -30,19 +35,21 @@ def showmap(
     if isinstance(color, str):
         cmap = None
 
+    index = path.index
     if isinstance(path, gpd.GeoDataFrame):
         extent = tmb.extent_from_frame(path)
         coords = path.get_coordinates()
-        path = coords.apply(lambda p: tmb.project(p.x, p.y), axis=1)
+        x, y = project_lonlat(coords.x.values, coords.y.values)
     else:
+        longitude = path["Longitude"].values
+        latitude = path["Latitude"].values
         extent = tmb.Extent.from_lonlat(
-            np.min(path["Longitude"].values),
-            np.max(path["Longitude"].values),
-            np.min(path["Latitude"].values),
-            np.max(path["Latitude"].values),
+            np.min(longitude),
+            np.max(longitude),
+            np.min(latitude),
+            np.max(latitude),
         )
-        path = [tmb.project(x, y) for x, y in zip(path["Longitude"].values, path["Latitude"].values)]
-    x, y = zip(*path)
+        x, y = project_lonlat(longitude, latitude)
 
     if to_aspect is not None:
         extent = extent.to_aspect(to_aspect)
@@ -56,13 +63,22 @@ def showmap(
     plotter.plot(ax)
 
     if color is None:
-        color = mdates.date2num(path.index)
+        color = mdates.date2num(index)
         if len(cbarkwargs) == 0:
             loc = mdates.AutoDateLocator()
             cbarkwargs["ticks"] = loc
             cbarkwargs["format"] = mdates.ConciseDateFormatter(loc)
             cbarkwargs["label"] = "time"
 
+    if decimate:
+        window = ax.get_window_extent()
+        resolution = max(extent.width / window.width, extent.height / window.height)
+        n_points = len(x)
+        keep = decimate_points(x, y, resolution)
+        x, y = x[keep], y[keep]
+        if not isinstance(color, str) and np.ndim(color) > 0 and len(color) == n_points:
+            color = np.asarray(color)[keep]
+
     im = ax.scatter(x, y, c=color, s=markersize, cmap=cmap)
     if cmap is not None:
         divider = make_axes_locatable(ax)
@@ -71,11 +87,186 @@ def showmap(
     return fig
 
 
-def exploremap(data: gpd.GeoDataFrame, **kwargs):
+def project_lonlat(longitude, latitude) -> tuple[np.ndarray, np.ndarray]:
+    """Projects arrays of longitude / latitude coordinates to Web Mercator,
+    normalized to the unit square as in tilemapbase.project.
+
+    Args:
+        longitude (array_like): Longitude in degrees, between -180 and 180.
+        latitude (array_like): Latitude in degrees, between -90 and 90 (exclusive).
+
+    Raises:
+        ValueError: Raises an error if any coordinate is out of the valid range.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Normalized x and y coordinates.
+    """
+    longitude = np.asarray(longitude, dtype=np.float64)
+    latitude = np.asarray(latitude, dtype=np.float64)
+    if np.any((longitude < -180) | (longitude > 180) | (latitude <= -90) | (latitude >= 90)):
+        raise ValueError(
+            "Longitude/Latitude values are out of valid range [-180,180] / [-90,90]. Did you swap them around?"
+        )
+    x = (longitude + 180.0) / 360.0
+    # log(tan(phi) + sec(phi)) == arcsinh(tan(phi))
+    y = (1.0 - np.arcsinh(np.tan(np.radians(latitude))) / np.pi) / 2.0
+    return x, y
+
+
+def decimate_points(x: np.ndarray, y: np.ndarray, resolution: float) -> np.ndarray:
+    """Selects the points of a path that fall on a different grid cell than the point
+    before them, so consecutive points drawn on the same screen pixel are plotted once.
+
+    Args:
+        x (np.ndarray): Projected x coordinates, in path order.
+        y (np.ndarray): Projected y coordinates, in path order.
+        resolution (float): Size of the grid cells, in projected units.
+
+    Returns:
+        np.ndarray: Sorted indices of the selected points.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) == 0 or not resolution > 0:
+        return np.arange(len(x))
+    cx = np.floor(x / resolution)
+    cy = np.floor(y / resolution)
+    changed = np.ones(len(x), dtype=bool)
+    changed[1:] = (cx[1:] != cx[:-1]) | (cy[1:] != cy[:-1])
+    return np.flatnonzero(changed)
+
+
+def rasterize_density(
+    paths,
+    width: int = 1024,
+    height: Optional[int] = None,
+    extent: Optional[tmb.Extent] = None,
+    column: Optional[str] = None,
+    statistic: str = "count",
+    shading: str = "log",
+    cmap="viridis",
+) -> tuple[np.ndarray, tmb.Extent]:
+    """Renders one or many tracks as a density image, by binning their Web Mercator
+    projected points into pixels. No map tiles are needed, and rendering time is
+    dominated by the image size rather than by the number of points.
+
+    Args:
+        paths (Union[pd.DataFrame, Iterable[pd.DataFrame]]): Track or list of tracks, either\
+            GeoDataFrames of points or DataFrames with Longitude and Latitude columns.
+        width (int, optional): Image width in pixels. Defaults to 1024.
+        height (Optional[int], optional): Image height in pixels. If None, it is computed\
+            from the aspect ratio of the extent. Defaults to None.
+        extent (Optional[tmb.Extent], optional): Area to render. If None, the bounds of all\
+            tracks are used. Defaults to None.
+        column (Optional[str], optional): Column used to weight each point, e.g. a resampled\
+            stream value. Defaults to None.
+        statistic (str, optional): Value of each pixel, either "count" (number of points),\
+            "sum" or "mean" (of the column values). Defaults to "count".
+        shading (str, optional): Mapping of pixel values to colors, either "linear", "log"\
+            or "eq_hist" (histogram equalization). Defaults to "log".
+        cmap (optional): Matplotlib colormap, or its name. Defaults to "viridis".
+
+    Returns:
+        tuple[np.ndarray, tmb.Extent]: RGBA image of shape (height, width, 4), where pixels\
+            without points are transparent, and the extent it covers, e.g. to draw it over a map\
+            with ax.imshow(image, extent=(extent.xmin, extent.xmax, extent.ymax, extent.ymin)).
+    """
+    if statistic not in ("count", "sum", "mean"):
+        raise ValueError(f"Unsupported statistic {statistic}. Must be 'count', 'sum' or 'mean'.")
+    if statistic != "count" and column is None:
+        raise ValueError(f"A column must be specified to compute the {statistic} statistic.")
+    if isinstance(paths, pd.DataFrame):
+        paths = [paths]
+    paths = [path for path in paths if len(path) > 0]
+    tracks = [_track_lonlat(path) for path in paths]
+
+    if extent is None:
+        bounds = np.array(
+            [[np.nanmin(lon), np.nanmax(lon), np.nanmin(lat), np.nanmax(lat)] for lon, lat in tracks]
+        )
+        extent = tmb.Extent.from_lonlat(
+            np.min(bounds[:, 0]), np.max(bounds[:, 1]), np.min(bounds[:, 2]), np.max(bounds[:, 3])
+        )
+    if height is None:
+        height = max(1, int(round(width * extent.height / extent.width))) if extent.width > 0 else width
+
+    counts = np.zeros(width * height)
+    sums = np.zeros(width * height) if column is not None else None
+    weighted = np.zeros(width * height) if column is not None else None
+    for path, (lon, lat) in zip(paths, tracks):
+        x, y = project_lonlat(lon, lat)
+        col = np.floor((x - extent.xmin) / extent.width * width) if extent.width > 0 else np.zeros_like(x)
+        row = np.floor((y - extent.ymin) / extent.height * height) if extent.height > 0 else np.zeros_like(y)
+        inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+        pixels = (row[inside] * width + col[inside]).astype(np.intp)
+        counts += np.bincount(pixels, minlength=width * height)
+        if sums is not None:
+            weights = np.asarray(path[column], dtype=np.float64)[inside]
+            valid = np.isfinite(weights)
+            sums += np.bincount(pixels[valid], weights=weights[valid], minlength=width * height)
+            weighted += np.bincount(pixels[valid], minlength=width * height)
+
+    if statistic == "count":
+        values, mask = counts, counts > 0
+    elif statistic == "sum":
+        values, mask = sums, weighted > 0
+    else:
+        mask = weighted > 0
+        values = np.divide(sums, weighted, out=np.zeros_like(sums), where=mask)
+    image = _shade(values, mask, shading, cmap)
+    return image.reshape(height, width, 4), extent
+
+
+def _track_lonlat(path) -> tuple[np.ndarray, np.ndarray]:
+    if isinstance(path, gpd.GeoDataFrame):
+        coords = path.get_coordinates()
+        return coords.x.values, coords.y.values
+    return path["Longitude"].values, path["Latitude"].values
+
+
+def _shade(values: np.ndarray, mask: np.ndarray, shading: str, cmap) -> np.ndarray:
+    """Maps the masked pixel values to RGBA colors, leaving other pixels transparent."""
+    data = values[mask]
+    if shading == "linear":
+        scaled = data
+    elif shading == "log":
+        scaled = np.log1p(data - np.min(data)) if data.size > 0 else data
+    elif shading == "eq_hist":
+        # ranks of the distinct values spread colors evenly across the occupied pixels
+        unique, inverse, counts = np.unique(data, return_inverse=True, return_counts=True)
+        scaled = np.cumsum(counts)[inverse].astype(np.float64)
+    else:
+        raise ValueError(f"Unsupported shading {shading}. Must be 'linear', 'log' or 'eq_hist'.")
+
+    image = np.zeros((len(values), 4), dtype=np.uint8)
+    if data.size > 0:
+        low, high = np.min(scaled), np.max(scaled)
+        normalized = (scaled - low) / (high - low) if high > low else np.ones_like(scaled)
+        image[mask] = plt.get_cmap(cmap)(normalized, bytes=True)
+    return image
+
+
+def exploremap(data: gpd.GeoDataFrame, tolerance: Optional[float] = None, **kwargs):
+    """Shows an interactive map of a time-indexed GeoDataFrame, color-coded by time
+    unless a column is specified.
+
+    Args:
+        data (gpd.GeoDataFrame): Time-indexed point data to show.
+        tolerance (Optional[float], optional): If set, the track is simplified to line\
+            segments deviating at most this many meters from the original points, each\
+            with the start and end time of the segment as attributes. Defaults to None.
+    """
     index = data.index
     data = data.reset_index(drop=True)
 
     column = kwargs.get("column")
+    if isinstance(column, pd.Series):
+        data[column.name] = column.reset_index(drop=True)
+        kwargs["column"] = column.name
+
+    if tolerance is not None:
+        data, index = _simplify_track_segments(data, index, tolerance)
+
     if column is None:
         minutes = (index - index[0]).to_series(index=data.index).dt.total_seconds() / 60
         kwargs["column"] = minutes
@@ -83,19 +274,72 @@ def exploremap(data: gpd.GeoDataFrame, **kwargs):
         if "caption" not in legend_kwds:
             legend_kwds["caption"] = "time (minutes)"
         kwargs["legend_kwds"] = legend_kwds
-    elif isinstance(column, pd.Series):
-        data[column.name] = column.reset_index(drop=True)
-        kwargs["column"] = column.name
 
     if "cmap" not in kwargs:
         kwargs["cmap"] = "jet"
     return data.explore(**kwargs)
 
 
-def export_kml_line(df: pd.DataFrame, output_path: str = "walk.kml", **kwargs):
+def _simplify_track_segments(data: gpd.GeoDataFrame, index: pd.Index, tolerance: float):
+    coords = data.get_coordinates()
+    keep = simplify_lonlat(coords.x.values, coords.y.values, tolerance)
+    if len(keep) < 2:
+        return data.iloc[keep], index[keep]
+
+    start, end = keep[:-1], keep[1:]
+    xy = coords[["x", "y"]].values
+    segments = shapely.linestrings(np.stack([xy[start], xy[end]], axis=1))
+    times = index.values
+    data = gpd.GeoDataFrame(
+        data.drop(columns=data.geometry.name).iloc[start].reset_index(drop=True),
+        geometry=segments,
+        crs=data.crs,
+    )
+    data["start"] = _iso_times(times[start])
+    data["end"] = _iso_times(times[end])
+    return data, index[start]
+
+
+def _iso_times(times: np.ndarray) -> np.ndarray:
+    return np.char.add(np.datetime_as_string(times, unit="ms"), "Z")
+
+
+def export_kml_line(
+    df: pd.DataFrame,
+    output_path: str = "walk.kml",
+    tolerance: Optional[float] = None,
+    time_segments: bool = False,
+    **kwargs,
+):
+    """Exports a track to a KML file as a line.
+
+    Args:
+        df (pd.DataFrame): Time-indexed track with Longitude and Latitude columns.
+        output_path (str, optional): Output file path. Defaults to "walk.kml".
+        tolerance (Optional[float], optional): If set, the track is simplified such that\
+            the line deviates at most this many meters from the original points. Defaults to None.
+        time_segments (bool, optional): If True, each line segment is written as its own\
+            line with the time span between its two points. Defaults to False.
+    """
+    longitude = df.Longitude.values
+    latitude = df.Latitude.values
+    keep = np.arange(len(df)) if tolerance is None else simplify_lonlat(longitude, latitude, tolerance)
+    coords = list(zip(longitude[keep], latitude[keep]))
+
     kml = simplekml.Kml()
-    ls = kml.newlinestring(**kwargs)
-    ls.coords = [(x, y) for x, y in zip(df.Longitude.values, df.Latitude.values)]
-    ls.extrude = 1
-    ls.altitudemode = simplekml.AltitudeMode.relativetoground
+    if time_segments:
+        times = _iso_times(df.index.values[keep])
+        lines = []
+        for i in range(len(coords) - 1):
+            ls = kml.newlinestring(**kwargs)
+            ls.coords = coords[i : i + 2]
+            ls.timespan.begin = times[i]
+            ls.timespan.end = times[i + 1]
+            lines.append(ls)
+    else:
+        lines = [kml.newlinestring(**kwargs)]
+        lines[0].coords = coords
+    for ls in lines:
+        ls.extrude = 1
+        ls.altitudemode = simplekml.AltitudeMode.relativetoground
     kml.save(output_path)
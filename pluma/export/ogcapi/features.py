@@ -1,10 +1,17 @@
 from __future__ import annotations
+import os
+import json
 import datetime
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import shapely
 import geopandas as gpd
 import pluma.preprocessing.resampling as resampling
 
 from dotmap import DotMap
+from typing import Optional, Union
 from pluma.stream import Stream
 
 
@@ -39,23 +46,286 @@ def convert_dataset_to_geoframe(dataset, sampling_dt: datetime.timedelta = datet
 
 
 def export_dataset_to_geojson(
-    dataset, filename, sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1)
+    dataset,
+    filename,
+    sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1),
+    ndjson: bool = False,
 ):
     out = convert_dataset_to_geoframe(dataset, sampling_dt)
-    export_geoframe_to_geojson(out, filename)
+    export_geoframe_to_geojson(out, filename, ndjson=ndjson)
 
 
-def export_geoframe_to_geojson(frame, filename):
-    micro_format = ".%f"
-    try:
-        if frame.index.freq.delta.to_pytimedelta().microseconds == 0:
-            micro_format = ""
-    except Exception:
-        pass
+def export_geoframe_to_geojson(
+    frame: gpd.GeoDataFrame,
+    filename: str,
+    ndjson: bool = False,
+    chunk_size: int = 50000,
+):
+    """Writes a time-indexed point GeoDataFrame as GeoJSON, streaming features
+    to the file in chunks.
+
+    Each feature has an integer id, the ISO 8601 UTC time of its index entry and
+    one property per column, following the layout of the OGR GeoJSON driver. All
+    features of a chunk are serialized with vectorized kernels directly from the
+    column arrays. Numbers are written in their shortest round-trip form, with
+    properties rounded to 15 significant digits and coordinates rounded to the
+    precision of the OGR drivers: 15 decimals, or 7 decimals (3 for elevations)
+    for newline-delimited GeoJSON. Frames with non-point geometries are written
+    through the OGR driver.
+
+    Args:
+        frame (gpd.GeoDataFrame): Frame to export, indexed by time.
+        filename (str): Output file path.
+        ndjson (bool, optional): If True, features are written one per line as\
+            newline-delimited GeoJSON, without the enclosing FeatureCollection. Defaults to False.
+        chunk_size (int, optional): Number of features serialized at a time. Defaults to 50000.
+    """
+    time_unit = _time_unit(frame.index)
+    crs_name = _crs_name(frame.crs)
+    if not _is_point_frame(frame) or crs_name is False:
+        _export_geoframe_to_ogr(frame, filename, time_unit, ndjson)
+        return
+
+    separator = "\n" if ndjson else ",\n"
+    precision, z_precision = (7, 3) if ndjson else (15, 15)
+    with open(filename, "wb") as stream:
+        if not ndjson:
+            name = os.path.splitext(os.path.basename(filename))[0]
+            stream.write(
+                f'{{\n"type": "FeatureCollection",\n"name": {json.dumps(name, ensure_ascii=False)},\n'.encode()
+            )
+            if crs_name is not None:
+                stream.write(
+                    f'"crs": {{ "type": "name", "properties": {{ "name": "{crs_name}" }} }},\n'.encode()
+                )
+            stream.write(b'"features": [\n')
+        for start in range(0, len(frame), chunk_size):
+            chunk = frame.iloc[start : start + chunk_size]
+            features = _serialize_features(
+                chunk, np.arange(start, start + len(chunk)), time_unit, precision, z_precision
+            )
+            if start > 0:
+                stream.write(separator.encode())
+            features = pa.ListArray.from_arrays(pa.array([0, len(features)], pa.int32()), features)
+            stream.write(pc.binary_join(features, separator)[0].as_buffer())
+        if ndjson:
+            stream.write(b"\n" if len(frame) > 0 else b"")
+        else:
+            stream.write(b"\n]\n}\n")
+
+
+def export_dataset_to_geoparquet(
+    dataset,
+    filename,
+    sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1),
+    **kwargs,
+):
+    out = convert_dataset_to_geoframe(dataset, sampling_dt)
+    export_geoframe_to_geoparquet(out, filename, **kwargs)
+
+
+def export_geoframe_to_geoparquet(
+    frame: gpd.GeoDataFrame,
+    filename: str,
+    partition_freq: Optional[str] = None,
+    row_group_size: int = 100000,
+    compression: str = "zstd",
+):
+    """Writes a time-indexed GeoDataFrame as GeoParquet, with WKB geometry
+    and a bounding box column that allows readers to filter rows spatially.
+
+    Args:
+        frame (gpd.GeoDataFrame): Frame to export, indexed by time.
+        filename (str): Output file path, or the output folder if the data is partitioned.
+        partition_freq (Optional[str], optional): If set, rows are split into time bins of\
+            this frequency, e.g. "1D" or "1h", and each bin is written to its own file in a\
+            hive-style "partition=<bin start>" sub-folder. Defaults to None.
+        row_group_size (int, optional): Maximum number of rows per row group. Defaults to 100000.
+        compression (str, optional): Parquet compression codec. Defaults to "zstd".
+    """
+    out = frame.reset_index(names="time")
+    kwargs = dict(
+        index=False,
+        compression=compression,
+        write_covering_bbox=True,
+        row_group_size=row_group_size,
+    )
+    if partition_freq is None:
+        out.to_parquet(filename, **kwargs)
+        return
+
+    bins = frame.index.floor(partition_freq)
+    for start, rows in out.groupby(bins, sort=True).indices.items():
+        folder = os.path.join(filename, f"partition={start.strftime('%Y%m%dT%H%M%S')}")
+        os.makedirs(folder, exist_ok=True)
+        out.iloc[rows].to_parquet(os.path.join(folder, "part-0.parquet"), **kwargs)
+
+
+def _export_geoframe_to_ogr(frame, filename, time_unit: str, ndjson: bool):
+    micro_format = ".%f" if time_unit == "us" else ""
     out = frame.reset_index(names="time")
     out.time = out.time.dt.strftime(f"%Y-%m-%dT%H:%M:%S{micro_format}Z")
     out.index.name = "id"
-    out.to_file(filename, driver="GeoJSON", index=True)
+    out.to_file(filename, driver="GeoJSONSeq" if ndjson else "GeoJSON", index=True)
+
+
+def _crs_name(crs) -> Union[str, None, bool]:
+    if crs is None:
+        return None
+    epsg = crs.to_epsg()
+    if epsg is None:
+        return False
+    return "urn:ogc:def:crs:OGC:1.3:CRS84" if epsg == 4326 else f"urn:ogc:def:crs:EPSG::{epsg}"
+
+
+def _time_unit(index: pd.DatetimeIndex) -> str:
+    # whole seconds are written without the fractional part when the sampling period allows it
+    try:
+        if pd.Timedelta(index.freq).to_pytimedelta().microseconds == 0:
+            return "s"
+    except Exception:
+        pass
+    return "us"
+
+
+def _is_point_frame(frame: gpd.GeoDataFrame) -> bool:
+    geometry = frame.geometry.values
+    return bool(np.all(shapely.is_missing(geometry) | (shapely.get_type_id(geometry) == 0)))
+
+
+def _serialize_features(
+    frame: gpd.GeoDataFrame,
+    ids: np.ndarray,
+    time_unit: str,
+    precision: int = 15,
+    z_precision: int = 15,
+) -> pa.Array:
+    """Serializes each row of a time-indexed point frame to a GeoJSON feature, with
+    horizontal and vertical coordinates rounded to the given number of decimals."""
+    pieces = [
+        '{ "type": "Feature", "properties": { "id": ',
+        pc.cast(pa.array(np.asarray(ids, dtype=np.int64)), pa.string()),
+        ', "time": ',
+        _json_datetimes(frame.index.values, time_unit, suffix="Z"),
+    ]
+    for name in frame.columns:
+        if name == frame.geometry.name:
+            continue
+        values, omit = _json_values(frame[name])
+        piece = pc.binary_join_element_wise(f", {json.dumps(str(name), ensure_ascii=False)}: ", values, "")
+        pieces.append(piece if omit is None else pc.if_else(omit, "", piece))
+    pieces += [' }, "geometry": ', _json_points(frame.geometry.values, precision, z_precision), " }"]
+    return pc.binary_join_element_wise(*pieces, "")
+
+
+def _json_values(series: pd.Series) -> tuple:
+    """Serializes a column to JSON text, with null for missing values. Also returns a mask
+    of values that are omitted from the properties, which the OGR driver does for infinities."""
+    values = series.values
+    if pd.api.types.is_bool_dtype(values) and not isinstance(values, pd.Categorical):
+        return _json_text(pc.cast(pa.array(series, from_pandas=True), pa.string())), None
+    if pd.api.types.is_integer_dtype(values):
+        return _json_text(pc.cast(pa.array(series, from_pandas=True), pa.string())), None
+    if pd.api.types.is_float_dtype(values):
+        values = np.asarray(values)
+        return _json_text(_json_floats(values)), pa.array(np.isinf(values))
+    if pd.api.types.is_datetime64_dtype(values):
+        return _json_text(_json_datetimes(np.asarray(values), "ms")), None
+    return _json_text(_json_strings(series)), None
+
+
+def _json_text(values: pa.Array) -> pa.Array:
+    return pc.fill_null(values, "null")
+
+
+def _json_floats(values: np.ndarray) -> pa.Array:
+    # properties are written with 15 significant digits, so 0.1 + 0.2 is written as 0.3
+    return _json_numbers(_round_significant(np.asarray(values, dtype=np.float64), 15))
+
+
+def _json_coordinates(values: np.ndarray, precision: int) -> pa.Array:
+    values = np.asarray(values, dtype=np.float64)
+    # rounding only changes values with digits past the precision, and scaling larger values could overflow
+    rounded = np.abs(values) < 2.0**52 / 10.0**precision
+    values = values.copy()
+    values[rounded] = np.round(values[rounded], precision)
+    return _json_numbers(values)
+
+
+def _json_numbers(values: np.ndarray) -> pa.Array:
+    """Writes numbers in their shortest round-trip form, with null for missing values."""
+    text = pc.cast(pa.array(values, from_pandas=True), pa.string())
+    # integral values are written with a decimal point, so they are not read back as integers
+    integral = pc.match_substring_regex(text, r"^-?[0-9]+$")
+    return pc.if_else(integral, pc.binary_join_element_wise(text, ".0", ""), text)
+
+
+def _round_significant(values: np.ndarray, digits: int) -> np.ndarray:
+    """Rounds values to a number of significant digits. Powers of ten are only exact
+    up to 1e22, so values needing larger scale factors are kept at full precision."""
+    out = values.copy()
+    valid = np.isfinite(values) & (values != 0)
+    decimals = digits - 1 - np.floor(np.log10(np.abs(values[valid]))).astype(np.int64)
+    exact = np.abs(decimals) <= 22
+    index = np.flatnonzero(valid)[exact]
+    decimals = decimals[exact]
+    scale = 10.0 ** np.abs(decimals)
+    x = values[index]
+    out[index] = np.where(decimals >= 0, np.rint(x * scale) / scale, np.rint(x / scale) * scale)
+    return out
+
+
+def _json_datetimes(values: np.ndarray, unit: str, suffix: str = "") -> pa.Array:
+    values = np.asarray(values, dtype="datetime64[ns]")
+    missing = np.isnat(values)
+    text = np.datetime_as_string(values, unit=unit)
+    if unit == "ms":
+        # OGR only writes milliseconds when they are not zero
+        whole = values.astype("datetime64[s]") == values.astype("datetime64[ms]")
+        text = np.where(whole, np.datetime_as_string(values, unit="s"), text)
+    text = pa.array(text, mask=missing)
+    return pc.binary_join_element_wise('"', text, f'{suffix}"', "")
+
+
+def _json_strings(series: pd.Series) -> pa.Array:
+    text = series.astype(object).where(series.notna(), None)
+    text = pa.array(text.map(lambda x: x if x is None or isinstance(x, str) else str(x)), type=pa.string())
+    for char, escape in _JSON_ESCAPES:
+        text = pc.replace_substring(text, char, escape)
+    if pc.any(pc.match_substring_regex(text, "[\x00-\x1f]")).as_py():
+        text = pa.array(
+            [None if x is None else json.dumps(x, ensure_ascii=False)[1:-1] for x in text.to_pylist()]
+        )
+    return pc.binary_join_element_wise('"', text, '"', "")
+
+
+_JSON_ESCAPES = [
+    ("\\", "\\\\"),
+    ('"', '\\"'),
+    ("\n", "\\n"),
+    ("\r", "\\r"),
+    ("\t", "\\t"),
+    ("\b", "\\b"),
+    ("\f", "\\f"),
+]
+
+
+def _json_points(geometry: np.ndarray, precision: int, z_precision: int) -> pa.Array:
+    missing = shapely.is_missing(geometry) | shapely.is_empty(geometry)
+    x = _json_coordinates(shapely.get_x(geometry), precision)
+    y = _json_coordinates(shapely.get_y(geometry), precision)
+    z = _json_coordinates(shapely.get_z(np.where(shapely.has_z(geometry), geometry, None)), z_precision)
+    z = pc.binary_join_element_wise(", ", z, "")
+    coordinates = pc.binary_join_element_wise(
+        '{ "type": "Point", "coordinates": [ ',
+        x,
+        ", ",
+        y,
+        pc.fill_null(z, ""),
+        " ] }",
+        "",
+    )
+    return pc.if_else(pa.array(missing), "null", coordinates)
 
 
 def recursive_resample_stream(acc_dict, stream, sampling_dt):
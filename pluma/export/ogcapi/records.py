@@ -1,12 +1,18 @@
+import json
 import jinja2
 import isodate
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from geopandas import GeoDataFrame
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
 
 from pluma.schema import Dataset
-from dataclasses import dataclass, field, fields
+from pluma.export.columnar import load_columnar_georeference, read_columnar_manifest
+from pluma.io.path_helper import ComplexPath
+from dataclasses import asdict, dataclass, field, fields
 
 _env = jinja2.Environment(loader=jinja2.PackageLoader("pluma"), autoescape=jinja2.select_autoescape)
 _template = _env.get_template("metadata_template.j2")
@@ -40,10 +46,85 @@ class RecordProperties:
     themes: list[Theme] = field(default_factory=lambda: [])
 
 
+@dataclass
+class DatasetInventory:
+    """Lightweight summary of the spatial and temporal extent of a dataset,
+    computed from its georeference alone and cheap to cache as JSON."""
+
+    id: str
+    start_date: pd.Timestamp
+    end_date: pd.Timestamp
+    bounds: list[float]
+    crs: str = "EPSG:4326"
+
+    @staticmethod
+    def from_georeference(id: str, spacetime: pd.DataFrame) -> "DatasetInventory":
+        """Builds the inventory from a georeference with Longitude and Latitude columns, indexed by time.
+
+        Args:
+            id (str): Identifier of the dataset.
+            spacetime (pd.DataFrame): Georeference of the dataset.
+        """
+        if spacetime is None or len(spacetime) == 0:
+            raise ValueError(f"Dataset {id} does not have a valid georeference.")
+        longitude = spacetime["Longitude"].to_numpy(dtype=np.float64)
+        latitude = spacetime["Latitude"].to_numpy(dtype=np.float64)
+        return DatasetInventory(
+            id=id,
+            start_date=spacetime.index[0],
+            end_date=spacetime.index[-1],
+            bounds=[
+                float(np.nanmin(longitude)),
+                float(np.nanmin(latitude)),
+                float(np.nanmax(longitude)),
+                float(np.nanmax(latitude)),
+            ],
+        )
+
+    @staticmethod
+    def from_dataset(dataset: Dataset) -> "DatasetInventory":
+        return DatasetInventory.from_georeference(_dataset_id(dataset), dataset.georeference.spacetime)
+
+    @staticmethod
+    def from_columnar(path: Union[str, ComplexPath]) -> "DatasetInventory":
+        """Builds the inventory of a dataset exported with Dataset.export_dataset_columnar,
+        reading only its manifest and georeference."""
+        manifest = read_columnar_manifest(path)
+        id = manifest["datasetlabel"] or Path(manifest["rootfolder"]).name.lower()
+        return DatasetInventory.from_georeference(id, load_columnar_georeference(path))
+
+    def to_dict(self) -> dict:
+        value = asdict(self)
+        value["start_date"] = self.start_date.isoformat()
+        value["end_date"] = self.end_date.isoformat()
+        return value
+
+    @staticmethod
+    def from_dict(value: dict) -> "DatasetInventory":
+        value = dict(value)
+        value["start_date"] = pd.Timestamp(value["start_date"])
+        value["end_date"] = pd.Timestamp(value["end_date"])
+        return DatasetInventory(**value)
+
+
+def write_inventory(inventories: Iterable[DatasetInventory], filename: str) -> None:
+    with open(filename, "w") as stream:
+        json.dump([inventory.to_dict() for inventory in inventories], stream, indent=2)
+
+
+def read_inventory(filename: str) -> list[DatasetInventory]:
+    with open(filename, "r") as stream:
+        return [DatasetInventory.from_dict(value) for value in json.load(stream)]
+
+
+def _dataset_id(dataset: Dataset) -> str:
+    root_path = Path(dataset.rootfolder.path)
+    return dataset.datasetlabel or f"{root_path.name.lower()}"
+
+
 class DatasetRecord:
     def __init__(self, dataset: Dataset, gdf: GeoDataFrame, properties: RecordProperties) -> None:
-        root_path = Path(dataset.rootfolder.path)
-        self.id = dataset.datasetlabel or f"{root_path.name.lower()}"
+        self.id = _dataset_id(dataset)
         self.start_date = gdf.index[0]
         self.end_date = gdf.index[-1]
         self.created_timestamp = pd.Timestamp(datetime.now(timezone.utc))
@@ -53,6 +134,41 @@ class DatasetRecord:
         self.crs = gdf.crs
         self.properties = properties
 
+    @staticmethod
+    def from_inventory(
+        inventory: DatasetInventory,
+        properties: RecordProperties,
+        sampling_dt: timedelta = timedelta(seconds=1),
+    ) -> "DatasetRecord":
+        """Creates the record of a dataset exported with the specified sampling period,
+        without resampling the dataset.
+
+        The temporal extent matches the resampled georeference exactly, and the
+        bounding box encloses all georeference points, so it contains the bounds
+        of the resampled data.
+
+        Args:
+            inventory (DatasetInventory): Extent of the dataset.
+            properties (RecordProperties): Record properties.
+            sampling_dt (timedelta, optional): Sampling period of the exported data.\
+                Defaults to timedelta(seconds=1).
+        """
+        sampling_dt = pd.Timedelta(sampling_dt)
+        record = DatasetRecord.__new__(DatasetRecord)
+        record.id = inventory.id
+        record.start_date = inventory.start_date
+        # resampling bins start at the first sample, so the last bin starts a whole number of periods later
+        record.end_date = (
+            inventory.start_date + ((inventory.end_date - inventory.start_date) // sampling_dt) * sampling_dt
+        )
+        record.created_timestamp = pd.Timestamp(datetime.now(timezone.utc))
+        record.updated_timestamp = record.created_timestamp
+        record.resolution = isodate.duration_isoformat(sampling_dt)
+        record.bounds = np.asarray(inventory.bounds)
+        record.crs = inventory.crs
+        record.properties = properties
+        return record
+
     def to_json(self) -> str:
         return _template.render(
             id=self.id,
@@ -70,6 +186,61 @@ class DatasetRecord:
                     [self.bounds[0], self.bounds[1]],
                 ]
             ],
-            crs=self.crs.to_string(),
+            crs=self.crs if isinstance(self.crs, str) else self.crs.to_string(),
             **(dict((field.name, getattr(self.properties, field.name)) for field in fields(self.properties))),
         )
+
+
+def export_records_collection(
+    datasets: Iterable[Union[Dataset, DatasetInventory, str, ComplexPath]],
+    properties: Union[RecordProperties, Callable[[DatasetInventory], RecordProperties]],
+    filename: str,
+    sampling_dt: timedelta = timedelta(seconds=1),
+    max_workers: Optional[int] = None,
+) -> list[dict]:
+    """Renders the records of many datasets and writes them as a single records collection.
+
+    Records are built from the extent of each dataset's georeference, so no dataset
+    is resampled. Inventories and records are computed concurrently.
+
+    Args:
+        datasets (Iterable[Union[Dataset, DatasetInventory, str, ComplexPath]]): Loaded datasets,\
+            cached inventories, or folders of datasets exported with Dataset.export_dataset_columnar.
+        properties (Union[RecordProperties, Callable[[DatasetInventory], RecordProperties]]):\
+            Properties shared by all records, or a function returning the properties of each dataset.
+        filename (str): Output file path.
+        sampling_dt (timedelta, optional): Sampling period of the exported data.\
+            Defaults to timedelta(seconds=1).
+        max_workers (Optional[int], optional): Maximum number of records built concurrently.\
+            If None, it will default to the ThreadPoolExecutor default.
+
+    Returns:
+        list[dict]: The records in the collection.
+    """
+
+    def _build_record(item):
+        inventory = _as_inventory(item)
+        record_properties = properties(inventory) if callable(properties) else properties
+        record = DatasetRecord.from_inventory(inventory, record_properties, sampling_dt)
+        return json.loads(record.to_json())
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        records = list(executor.map(_build_record, datasets))
+
+    collection = {
+        "type": "FeatureCollection",
+        "numberMatched": len(records),
+        "numberReturned": len(records),
+        "features": records,
+    }
+    with open(filename, "w") as stream:
+        json.dump(collection, stream, indent=2)
+    return records
+
+
+def _as_inventory(item) -> DatasetInventory:
+    if isinstance(item, DatasetInventory):
+        return item
+    if isinstance(item, Dataset):
+        return DatasetInventory.from_dataset(item)
+    return DatasetInventory.from_columnar(item)
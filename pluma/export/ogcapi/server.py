@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import json
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+import shapely
+import geopandas as gpd
+
+from typing import Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pluma.export.ogcapi.features import (
+    convert_dataset_to_geoframe,
+    _is_point_frame,
+    _serialize_features,
+    _time_unit,
+)
+
+_GEOJSON_TYPE = "application/geo+json"
+_JSON_TYPE = "application/json"
+_CONFORMANCE = [
+    "http://www.opengis.net/spec/ogcapi-features-1/1.0/conf/core",
+    "http://www.opengis.net/spec/ogcapi-features-1/1.0/conf/geojson",
+]
+
+
+class FeatureCollection:
+    """Time-indexed point features with a spatial index over their geometry.
+
+    Time intervals are resolved by binary search on the sorted time index, and
+    bounding boxes by querying an STR-tree, so queries never scan all features.
+
+    Args:
+        id (str): Identifier of the collection.
+        frame (gpd.GeoDataFrame): Point features, indexed by time.
+        title (Optional[str], optional): Human readable title. Defaults to None.
+    """
+
+    def __init__(self, id: str, frame: gpd.GeoDataFrame, title: Optional[str] = None) -> None:
+        if not _is_point_frame(frame):
+            raise ValueError(f"Collection {id} must only contain point geometries.")
+        if not frame.index.is_monotonic_increasing:
+            frame = frame.sort_index(kind="stable")
+        self.id = id
+        self.title = title or id
+        self.frame = frame
+        self.times = frame.index.values.astype("datetime64[ns]")
+        self.tree = shapely.STRtree(frame.geometry.values)
+        self.time_unit = _time_unit(frame.index)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def query(
+        self,
+        bbox: Optional[tuple[float, float, float, float]] = None,
+        interval: Optional[tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]] = None,
+    ) -> np.ndarray:
+        """Finds the features within a bounding box and time interval.
+
+        Args:
+            bbox (Optional[tuple[float, float, float, float]], optional): Bounding box as\
+                (minx, miny, maxx, maxy). Defaults to None.
+            interval (Optional[tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]], optional):\
+                Closed time interval, where None leaves the interval open on that end. Defaults to None.
+
+        Returns:
+            np.ndarray: Sorted positions of the matching features.
+        """
+        start, end = 0, len(self.frame)
+        if interval is not None:
+            lower, upper = interval
+            if lower is not None:
+                start = np.searchsorted(self.times, np.datetime64(lower, "ns"), side="left")
+            if upper is not None:
+                end = np.searchsorted(self.times, np.datetime64(upper, "ns"), side="right")
+        if bbox is None:
+            return np.arange(start, max(start, end))
+
+        positions = np.sort(self.tree.query(shapely.box(*bbox), predicate="intersects"))
+        return positions[(positions >= start) & (positions < end)]
+
+    def features(self, positions: np.ndarray) -> list[str]:
+        """Serializes the features at the specified positions to GeoJSON, using the
+        position of each feature in the collection as its id."""
+        if len(positions) == 0:
+            return []
+        return _serialize_features(self.frame.iloc[positions], positions, self.time_unit).to_pylist()
+
+    def extent(self) -> dict:
+        extent = {}
+        bounds = self.frame.total_bounds
+        # collections without any geometry have no spatial extent
+        if np.all(np.isfinite(bounds)):
+            extent["spatial"] = {"bbox": [[float(x) for x in bounds]]}
+        times = (
+            [None, None]
+            if len(self.times) == 0
+            else [_format_time(self.times[0]), _format_time(self.times[-1])]
+        )
+        extent["temporal"] = {"interval": [times]}
+        return extent
+
+
+class FeatureStore:
+    """Collection of indexed features served by the OGC API Features server."""
+
+    def __init__(self) -> None:
+        self.collections: dict[str, FeatureCollection] = {}
+
+    def add_collection(
+        self, id: str, frame: gpd.GeoDataFrame, title: Optional[str] = None
+    ) -> FeatureCollection:
+        collection = FeatureCollection(id, frame, title=title)
+        self.collections[id] = collection
+        return collection
+
+    def add_dataset(
+        self,
+        dataset,
+        sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1),
+        id: Optional[str] = None,
+    ) -> FeatureCollection:
+        """Adds the output of convert_dataset_to_geoframe as a collection.
+
+        Args:
+            dataset (Dataset): Calibrated dataset.
+            sampling_dt (datetime.timedelta, optional): Sampling period of the features.\
+                Defaults to datetime.timedelta(seconds=1).
+            id (Optional[str], optional): Identifier of the collection. If None, the dataset\
+                label is used. Defaults to None.
+        """
+        frame = convert_dataset_to_geoframe(dataset, sampling_dt)
+        return self.add_collection(id or dataset.datasetlabel, frame)
+
+
+def create_feature_server(
+    store: FeatureStore, host: str = "127.0.0.1", port: int = 5000
+) -> ThreadingHTTPServer:
+    """Creates an OGC API Features server for the collections in a feature store.
+    Call serve_forever() on the returned server to start handling requests, and
+    shutdown() to stop it.
+
+    Args:
+        store (FeatureStore): Indexed features to serve.
+        host (str, optional): Host address to bind. Defaults to "127.0.0.1".
+        port (int, optional): Port to bind, or 0 to use any free port. Defaults to 5000.
+
+    Returns:
+        ThreadingHTTPServer: The server, handling each request in its own thread.
+    """
+    handler = type("FeatureRequestHandler", (_FeatureRequestHandler,), {"store": store})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve_features_in_background(
+    store: FeatureStore, host: str = "127.0.0.1", port: int = 0
+) -> ThreadingHTTPServer:
+    """Starts an OGC API Features server on a daemon thread, e.g. for interactive analysis.
+
+    Returns:
+        ThreadingHTTPServer: The running server. Its address is in server.server_address.
+    """
+    server = create_feature_server(store, host=host, port=port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _RequestError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _FeatureRequestHandler(BaseHTTPRequestHandler):
+    store: FeatureStore = None
+    default_limit = 10
+    max_limit = 10000
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if len(parts) == 0:
+                self._send_json(self._landing_page())
+            elif parts == ["conformance"]:
+                self._send_json({"conformsTo": _CONFORMANCE})
+            elif parts == ["collections"]:
+                self._send_json(
+                    {
+                        "links": [self._link("self", "/collections", _JSON_TYPE)],
+                        "collections": [self._collection(c) for c in self.store.collections.values()],
+                    }
+                )
+            elif len(parts) == 2 and parts[0] == "collections":
+                self._send_json(self._collection(self._get_collection(parts[1])))
+            elif len(parts) == 3 and parts[0] == "collections" and parts[2] == "items":
+                self._send_items(self._get_collection(parts[1]), url.path, params)
+            elif len(parts) == 4 and parts[0] == "collections" and parts[2] == "items":
+                self._send_item(self._get_collection(parts[1]), parts[3])
+            else:
+                raise _RequestError(404, f"Resource {url.path} was not found.")
+        except _RequestError as e:
+            self._send_json({"code": e.status, "description": str(e)}, status=e.status)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _get_collection(self, id: str) -> FeatureCollection:
+        if id not in self.store.collections:
+            raise _RequestError(404, f"Collection {id} was not found.")
+        return self.store.collections[id]
+
+    def _send_items(self, collection: FeatureCollection, path: str, params: dict):
+        limit = _parse_int(params.get("limit"), "limit", self.default_limit)
+        offset = _parse_int(params.get("offset"), "offset", 0)
+        if limit < 1:
+            raise _RequestError(400, "Parameter limit must be at least 1.")
+        limit = min(limit, self.max_limit)
+        positions = collection.query(
+            bbox=_parse_bbox(params.get("bbox")),
+            interval=_parse_datetime(params.get("datetime")),
+        )
+        page = positions[offset : offset + limit]
+
+        links = [self._link("self", _page_url(path, params, offset, limit), _GEOJSON_TYPE)]
+        if offset + limit < len(positions):
+            links.append(self._link("next", _page_url(path, params, offset + limit, limit), _GEOJSON_TYPE))
+        if offset > 0:
+            links.append(
+                self._link("prev", _page_url(path, params, max(0, offset - limit), limit), _GEOJSON_TYPE)
+            )
+
+        # features are serialized once, and only embedded in the response text
+        header = {
+            "type": "FeatureCollection",
+            "numberMatched": int(len(positions)),
+            "numberReturned": int(len(page)),
+            "timeStamp": pd.Timestamp.now("UTC").strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "links": links,
+        }
+        body = json.dumps(header)[:-1] + ', "features": [' + ",".join(collection.features(page)) + "]}"
+        self._send(body.encode(), _GEOJSON_TYPE)
+
+    def _send_item(self, collection: FeatureCollection, feature_id: str):
+        try:
+            position = int(feature_id)
+        except ValueError:
+            raise _RequestError(404, f"Feature {feature_id} was not found.")
+        if position < 0 or position >= len(collection):
+            raise _RequestError(404, f"Feature {feature_id} was not found.")
+        self._send(collection.features(np.array([position]))[0].encode(), _GEOJSON_TYPE)
+
+    def _landing_page(self) -> dict:
+        return {
+            "title": "pluma OGC API Features",
+            "links": [
+                self._link("self", "/", _JSON_TYPE),
+                self._link("conformance", "/conformance", _JSON_TYPE),
+                self._link("data", "/collections", _JSON_TYPE),
+            ],
+        }
+
+    def _collection(self, collection: FeatureCollection) -> dict:
+        return {
+            "id": collection.id,
+            "title": collection.title,
+            "itemType": "feature",
+            "extent": collection.extent(),
+            "links": [
+                self._link("self", f"/collections/{collection.id}", _JSON_TYPE),
+                self._link("items", f"/collections/{collection.id}/items", _GEOJSON_TYPE),
+            ],
+        }
+
+    def _link(self, rel: str, href: str, media_type: str) -> dict:
+        host = self.headers.get("Host") or "{}:{}".format(*self.server.server_address[:2])
+        return {"rel": rel, "type": media_type, "href": f"http://{host}{href}"}
+
+    def _send_json(self, value: dict, status: int = 200):
+        self._send(json.dumps(value).encode(), _JSON_TYPE, status=status)
+
+    def _send(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _page_url(path: str, params: dict, offset: int, limit: int) -> str:
+    return f"{path}?{urlencode({**params, 'offset': offset, 'limit': limit})}"
+
+
+def _parse_int(value: Optional[str], name: str, default: int) -> int:
+    if value is None:
+        return default
+    try:
+        result = int(value)
+    except ValueError:
+        raise _RequestError(400, f"Parameter {name} must be an integer.")
+    if result < 0:
+        raise _RequestError(400, f"Parameter {name} must not be negative.")
+    return result
+
+
+def _parse_bbox(value: Optional[str]) -> Optional[tuple[float, float, float, float]]:
+    if value is None:
+        return None
+    try:
+        coords = [float(x) for x in value.split(",")]
+    except ValueError:
+        raise _RequestError(400, "Parameter bbox must be a list of numbers.")
+    if len(coords) == 4:
+        return tuple(coords)
+    if len(coords) == 6:
+        return (coords[0], coords[1], coords[3], coords[4])
+    raise _RequestError(400, "Parameter bbox must have 4 or 6 numbers.")
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]]:
+    if value is None:
+        return None
+    bounds = value.split("/")
+    if len(bounds) > 2:
+        raise _RequestError(400, "Parameter datetime must be a date-time or an interval.")
+    try:
+        times = [None if bound in ("", "..") else _parse_timestamp(bound) for bound in bounds]
+    except ValueError:
+        raise _RequestError(400, f"Parameter datetime has an invalid date-time {value}.")
+    return (times[0], times[0]) if len(times) == 1 else (times[0], times[1])
+
+
+def _parse_timestamp(value: str) -> pd.Timestamp:
+    # features are indexed by naive UTC times
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp
+
+
+def _format_time(value: np.datetime64) -> str:
+    return f"{np.datetime_as_string(value, unit='s')}Z"
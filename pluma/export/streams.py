@@ -1,16 +1,27 @@
 ## Export streams to csv
 from __future__ import annotations
 import os
+import json
 import datetime
+import warnings
+import numpy as np
 import pandas as pd
 import geopandas as gpd
 
 from typing import Union, Optional, Callable, Dict
+from concurrent.futures import ThreadPoolExecutor
 
 from pluma.stream import Stream, StreamType
+from pluma.export.columnar import iter_stream_items
+from pluma.export.ogcapi.features import exclude_devices
 
 import pluma.preprocessing.resampling as resampling
 
+_CSV_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+_TABLE_MANIFEST_FILE = "manifest.json"
+# message of the ValueError raised by the resampling functions for streams without samples
+_EMPTY_DATA_ERROR = "Input dataframe is empty."
+
 
 def export_stream_to_csv(
     stream: Stream,
@@ -58,7 +69,100 @@ def export_uniform_table_stream(
     if not os.path.exists(outdir):
         os.makedirs(outdir, exist_ok=True)
     resampled = resampling_function(stream.data, georeference, **resampling_function_kws)
-    resampled.to_csv(f"{outdir}\\{stream.streamlabel}.csv", date_format="%Y-%m-%dT%H:%M:%S.%fZ")
+    resampled.to_csv(os.path.join(outdir, f"{stream.streamlabel}.csv"), date_format=_CSV_DATE_FORMAT)
+
+
+def export_streams_table(
+    dataset,
+    outdir: str,
+    sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1),
+    format: str = "parquet",
+    max_workers: Optional[int] = None,
+) -> dict:
+    """Resamples every stream of a dataset against the same resampled georeference,
+    and writes each stream to its own table file in a folder per device. Streams
+    are exported on a thread pool, but resampling mostly holds the GIL, so threads
+    mainly overlap the file writes. Streams of the devices in exclude_devices,
+    as in the GeoJSON export, are not exported. Streams without samples are skipped
+    with a warning.
+
+    Args:
+        dataset (Dataset): Calibrated dataset to export.
+        outdir (str): Output folder.
+        sampling_dt (datetime.timedelta, optional): Sampling period of the exported\
+            tables. Defaults to datetime.timedelta(seconds=1).
+        format (str, optional): Output file format, either "parquet" (GeoParquet) or "csv".\
+            Defaults to "parquet".
+        max_workers (Optional[int], optional): Maximum number of streams exported\
+            concurrently. If None, it will default to the ThreadPoolExecutor default.
+
+    Returns:
+        dict: Manifest listing the file, number of rows and time range of each exported stream,\
+            which is also written to the output folder.
+    """
+    if format not in ("parquet", "csv"):
+        raise ValueError(f"Unsupported table format {format}. Must be 'parquet' or 'csv'.")
+    if dataset.has_calibration is False:
+        raise ValueError(
+            "The Dataset does not have a valid calibration.\
+                Calibrate the Dataset before exporting the streams by\
+                    calling Dataset.add_georeference_and_calibrate()"
+        )
+
+    georef = resampling.resample_georeference(dataset.georeference.spacetime, sampling_dt)
+
+    def _export_stream(item):
+        key, stream = item
+        try:
+            resampled = stream.resample(georef)
+        except NotImplementedError:
+            return key, None
+        except ValueError as e:
+            if str(e) != _EMPTY_DATA_ERROR:
+                raise
+            warnings.warn(f"Stream {key} could not be exported: {e}")
+            return key, None
+
+        filename = f"{stream.device}/{stream.streamlabel}.{format}"
+        os.makedirs(os.path.join(outdir, stream.device), exist_ok=True)
+        if format == "parquet":
+            resampled.to_parquet(os.path.join(outdir, filename), compression="zstd")
+        else:
+            resampled.to_csv(os.path.join(outdir, filename), date_format=_CSV_DATE_FORMAT)
+        return key, {
+            "device": stream.device,
+            "streamlabel": stream.streamlabel,
+            "file": filename,
+            "rows": len(resampled),
+            "columns": [str(column) for column in resampled.columns],
+            "start": resampled.index[0].isoformat() if len(resampled) > 0 else None,
+            "end": resampled.index[-1].isoformat() if len(resampled) > 0 else None,
+        }
+
+    stream_items = [
+        (key, stream)
+        for key, stream in iter_stream_items(dataset.streams)
+        if stream.device not in exclude_devices and stream.data is not None and _has_resample(stream)
+    ]
+    os.makedirs(outdir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        streams = {
+            key: entry for key, entry in executor.map(_export_stream, stream_items) if entry is not None
+        }
+
+    manifest = {
+        "datasetlabel": dataset.datasetlabel,
+        "format": format,
+        "sampling_dt": sampling_dt.total_seconds(),
+        "streams": streams,
+    }
+    with open(os.path.join(outdir, _TABLE_MANIFEST_FILE), "w") as stream:
+        json.dump(manifest, stream, indent=2)
+    return manifest
+
+
+def _has_resample(stream: Stream) -> bool:
+    return type(stream).resample is not Stream.resample
 
 
 def resample_stream_harp(
@@ -109,6 +213,19 @@ def resample_stream_empatica(
     return _resample_multistream(stream, col_sampler, sampling_dt, data_selector=lambda x: x["Value"])
 
 
+def resample_stream_microphone(
+    stream: Stream, sampling_dt: datetime.timedelta = datetime.timedelta(seconds=2), **kwargs
+) -> gpd.GeoDataFrame:
+    check_stream_data_integrity(stream)
+    features = stream.acoustic_features(**kwargs)
+    # levels are averaged in the energy domain, not in dB
+    resampled = resampling.resample_temporospatial(
+        10 ** (features / 10), _get_resampled_georef(stream, sampling_dt), sampling_dt=None
+    )
+    resampled[features.columns] = 10 * np.log10(resampled[features.columns])
+    return resampled
+
+
 def resample_stream_ecg(
     stream: Stream, sampling_dt: datetime.timedelta = datetime.timedelta(seconds=2)
 ) -> gpd.GeoDataFrame:
@@ -1,9 +1,14 @@
+import os
 import warnings
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from typing import Union
 from pluma.io.harp import to_datetime
+from pluma.io.cache import cached_reader, join_path, source_fingerprint
+from pluma.io.columnar import write_columnar_frame, read_columnar_frame, read_columnar_metadata
 from pluma.io.path_helper import ComplexPath, ensure_complexpath
 
 _accelerometer_header = [
@@ -34,9 +39,26 @@ _accelerometer_header = [
     "SoftwareTimestamp",
 ]
 
+_accelerometer_dtypes = {
+    **{col: np.float32 for col in _accelerometer_header[:18]},
+    "SysCalibEnabled": bool,
+    "GyroCalibEnabled": bool,
+    "AccCalibEnabled": bool,
+    "MagCalibEnabled": bool,
+    "Temperature": np.float32,
+    "Timestamp": np.float64,
+    "SoftwareTimestamp": np.float64,
+}
 
+_SIDECAR_EXT = ".arrow"
+
+
+@cached_reader(lambda filename, root, **_: [join_path(root, filename)])
 def load_accelerometer(
-    filename: str = "Accelerometer.csv", root: Union[str, ComplexPath] = ""
+    filename: str = "Accelerometer.csv",
+    root: Union[str, ComplexPath] = "",
+    engine: str = "c",
+    sidecar: bool = False,
 ) -> pd.DataFrame:
     """Loads the raw accelerometer data from file to a pandas DataFrame.
 
@@ -46,6 +68,15 @@ def load_accelerometer(
             Input file name to target. Defaults to 'Accelerometer.csv'.
         root: str or ComplexPath
             Root path where filename is expected to be found. Defaults to ''.
+        engine: str
+            CSV parser engine passed to pandas.read_csv. Use 'pyarrow' for
+            multithreaded parsing. Defaults to 'c'.
+        sidecar: bool
+            If True, local files are parsed only once and the parsed data is
+            written to a binary sidecar file (filename + '.arrow') next to the
+            raw data, which is memory-mapped on later loads for as long as the
+            source file is unchanged. Prefer the shared ReaderCache when the raw
+            data folder should not be modified. Defaults to False.
 
     Returns
     -------
@@ -54,9 +85,22 @@ def load_accelerometer(
     """
     path = ensure_complexpath(root)
     path.join(filename)
+    sidecar_path = None
+    if sidecar and not path.iss3f():
+        fingerprint = source_fingerprint(path)
+        sidecar_path = path.path + _SIDECAR_EXT
+        if fingerprint is not None and _read_sidecar_fingerprint(sidecar_path) == fingerprint:
+            return read_columnar_frame(sidecar_path)
+
     try:
         with path.open("rb") as stream:
-            acc_df = pd.read_csv(stream, header=None, names=_accelerometer_header)
+            acc_df = pd.read_csv(
+                stream,
+                header=None,
+                names=_accelerometer_header,
+                dtype=_accelerometer_dtypes,
+                engine=engine,
+            )
     except FileNotFoundError:
         warnings.warn(f"Accelerometer stream file {path} could not be found.")
         return
@@ -67,4 +111,25 @@ def load_accelerometer(
     acc_df["Timestamp"] = to_datetime(acc_df["Timestamp"].values)
     acc_df["SoftwareTimestamp"] = to_datetime(acc_df["SoftwareTimestamp"].values)
     acc_df.set_index("Timestamp", inplace=True)
+
+    if sidecar_path is not None and fingerprint is not None:
+        _write_sidecar(acc_df, sidecar_path, fingerprint)
     return acc_df
+
+
+def _read_sidecar_fingerprint(sidecar_path: str):
+    try:
+        return read_columnar_metadata(sidecar_path)
+    except (OSError, ValueError, pa.ArrowInvalid):
+        return None
+
+
+def _write_sidecar(acc_df: pd.DataFrame, sidecar_path: str, fingerprint: dict) -> None:
+    tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+    try:
+        write_columnar_frame(acc_df, tmp_path, metadata=fingerprint)
+        os.replace(tmp_path, sidecar_path)
+    except OSError as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        warnings.warn(f"Accelerometer sidecar file {sidecar_path} could not be written: {e}")
@@ -0,0 +1,194 @@
+import os
+import json
+import shutil
+import hashlib
+import inspect
+import tempfile
+import warnings
+import functools
+
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from pluma.io.columnar import write_columnar, read_columnar
+from pluma.io.path_helper import ComplexPath, ensure_complexpath
+
+_ENTRY_FILE = "entry.json"
+_DEFAULT_MAX_BYTES = 4 * 1024**3
+
+_reader_cache = None
+
+
+class ReaderCache:
+    """Size-bounded on-disk cache of decoded reader outputs.
+
+    Entries are keyed on the reader name, the fingerprint (path, size and
+    modification time, or ETag for remote files) of every source file, and
+    the reader parameters. Outputs are stored with the columnar codec, so
+    cached arrays are memory-mapped copy-on-write when reloaded, and changes
+    to a loaded value never reach the cache. When the cache grows beyond
+    max_bytes, least recently used entries are evicted.
+    """
+
+    def __init__(self, cachedir: str, max_bytes: int = _DEFAULT_MAX_BYTES, memory_map: bool = True) -> None:
+        """
+        Args:
+            cachedir (str): Local folder where cache entries are stored.
+            max_bytes (int, optional): Maximum total size of the cache, in bytes. Defaults to 4 GiB.
+            memory_map (bool, optional): If True, cached files are memory-mapped when read. Defaults to True.
+        """
+        self.cachedir = os.path.abspath(os.path.expanduser(cachedir))
+        self.max_bytes = max_bytes
+        self.memory_map = memory_map
+        os.makedirs(self.cachedir, exist_ok=True)
+
+    def make_key(self, reader: str, sources: List[Union[str, ComplexPath]], params: dict) -> Optional[str]:
+        """Builds the cache key for a reader call, or returns None if any source file does not exist."""
+        fingerprints = [source_fingerprint(source) for source in sources]
+        if any(fingerprint is None for fingerprint in fingerprints):
+            return None
+        payload = json.dumps(
+            {"reader": reader, "sources": fingerprints, "params": params},
+            sort_keys=True,
+            default=_param_repr,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns a (hit, value) tuple for the specified cache key."""
+        folder = os.path.join(self.cachedir, key)
+        entry_path = os.path.join(folder, _ENTRY_FILE)
+        try:
+            with open(entry_path, "r") as stream:
+                entry = json.load(stream)
+            value = read_columnar(entry["data"], folder, memory_map=self.memory_map)
+        except (OSError, ValueError, KeyError):
+            return (False, None)
+        os.utime(entry_path)
+        return (True, value)
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores a value under the specified cache key and evicts old entries if needed."""
+        folder = tempfile.mkdtemp(dir=self.cachedir, prefix=".tmp-")
+        try:
+            entry = {"data": write_columnar(value, folder, "data")}
+            entry["nbytes"] = _folder_size(folder)
+            with open(os.path.join(folder, _ENTRY_FILE), "w") as stream:
+                json.dump(entry, stream)
+            target = os.path.join(self.cachedir, key)
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(folder, target)
+        except Exception as e:
+            shutil.rmtree(folder, ignore_errors=True)
+            warnings.warn(f"Reader output could not be cached: {e}")
+            return
+        self.evict()
+
+    def evict(self, max_bytes: Optional[int] = None) -> None:
+        """Removes least recently used entries until the cache is smaller than max_bytes."""
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = []
+        for item in os.scandir(self.cachedir):
+            entry_path = os.path.join(item.path, _ENTRY_FILE)
+            if not item.is_dir() or not os.path.exists(entry_path):
+                continue
+            try:
+                with open(entry_path, "r") as stream:
+                    nbytes = json.load(stream)["nbytes"]
+                entries.append((os.path.getmtime(entry_path), nbytes, item.path))
+            except (OSError, ValueError, KeyError):
+                continue
+
+        total = sum(entry[1] for entry in entries)
+        for _, nbytes, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= nbytes
+
+    def clear(self) -> None:
+        """Removes all cache entries."""
+        self.evict(max_bytes=0)
+
+
+def set_reader_cache(cache: Optional[ReaderCache]) -> None:
+    """Sets the cache shared by all cached readers. If None, caching is disabled."""
+    global _reader_cache
+    _reader_cache = cache
+
+
+def get_reader_cache() -> Optional[ReaderCache]:
+    """Returns the cache shared by all cached readers, or None if caching is disabled."""
+    return _reader_cache
+
+
+def source_fingerprint(path: Union[str, ComplexPath]) -> Optional[dict]:
+    """Returns the path, size and modification time (or ETag) of a file, or None if it does not exist."""
+    path = ensure_complexpath(path)
+    try:
+        if path.iss3f():
+            info = path.s3fs.info(path.path)
+            return {
+                "path": path.path,
+                "size": info.get("size"),
+                "etag": info.get("ETag", str(info.get("LastModified"))),
+            }
+        else:
+            stat = os.stat(path.path)
+            return {"path": os.path.abspath(path.path), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+    except (FileNotFoundError, OSError):
+        return None
+
+
+def cached_reader(sources: Callable[..., List[Union[str, ComplexPath, None]]]):
+    """Decorator that caches the decoded output of a reader function in the shared ReaderCache.
+
+    Args:
+        sources (Callable): Function receiving the reader arguments, by name, and returning\
+            the list of source files read by the reader.
+    """
+
+    def decorator(reader: Callable) -> Callable:
+        signature = inspect.signature(reader)
+        name = f"{reader.__module__}.{reader.__qualname__}"
+
+        @functools.wraps(reader)
+        def wrapper(*args, **kwargs):
+            cache = _reader_cache
+            if cache is None:
+                return reader(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            paths = sources(**bound.arguments)
+            key = None if None in paths else cache.make_key(name, paths, bound.arguments)
+            if key is None:
+                return reader(*args, **kwargs)
+
+            hit, value = cache.get(key)
+            if not hit:
+                value = reader(*args, **kwargs)
+                if value is not None:
+                    cache.put(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def join_path(root: Union[str, ComplexPath], filename: str) -> ComplexPath:
+    """Returns a new ComplexPath with filename joined to root."""
+    path = ensure_complexpath(root)
+    path.join(filename)
+    return path
+
+
+def _param_repr(value: Any) -> str:
+    if isinstance(value, ComplexPath):
+        return value.path
+    return repr(value)
+
+
+def _folder_size(folder: str) -> int:
+    return sum(item.stat().st_size for item in os.scandir(folder) if item.is_file())
@@ -0,0 +1,309 @@
+import io
+import os
+import json
+import pickle
+import warnings
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import geopandas as gpd
+
+from dotmap import DotMap
+from typing import Any, Optional, Union
+from collections.abc import Mapping
+
+from pluma.io.path_helper import ComplexPath, ensure_complexpath
+
+_PLUMA_METADATA = b"pluma"
+
+_FRAME_EXT = ".arrow"
+_ARRAY_EXT = ".npy"
+_PICKLE_EXT = ".pickle"
+_RAW_EXT = "_raw.fif"
+
+# fif sample formats of MNE Raw objects whose orig_format does not describe the
+# source samples; NEDF samples are 24-bit integers, which are stored exactly as
+# single precision floats once MNE divides them by their calibration factors
+_RAW_FORMATS = {"RawNedf": "single"}
+
+
+def write_columnar_frame(
+    df: Union[pd.DataFrame, pd.Series], path: Union[str, ComplexPath], metadata: Optional[dict] = None
+) -> None:
+    """Writes a DataFrame, and its index, to a single Arrow IPC file.
+
+    Geometry columns are stored as WKB and object columns that have no
+    Arrow equivalent are stored as pickled binary cells.
+
+    Args:
+        df (Union[pd.DataFrame, pd.Series]): Data to be written.
+        path (Union[str, ComplexPath]): Output file path.
+        metadata (Optional[dict], optional): JSON serializable metadata stored in the file,\
+            which can be read back with read_columnar_metadata. Defaults to None.
+    """
+    meta = {"series": None, "geometry": None, "pickled": [], "metadata": metadata}
+    if isinstance(df, pd.Series):
+        meta["series"] = df.name
+        df = df.to_frame(name="__series__")
+
+    if isinstance(df, gpd.GeoDataFrame):
+        meta["geometry"] = {
+            "column": df.geometry.name,
+            "crs": None if df.crs is None else df.crs.to_string(),
+        }
+        df = pd.DataFrame(df.assign(**{df.geometry.name: df.geometry.to_wkb()}))
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        df = df.copy(deep=False)
+        for col in df.select_dtypes(include=object).columns:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                df[col] = [pickle.dumps(x, protocol=pickle.HIGHEST_PROTOCOL) for x in df[col].values]
+                meta["pickled"].append(col)
+        table = pa.Table.from_pandas(df, preserve_index=True)
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[_PLUMA_METADATA] = json.dumps(meta).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    path = ensure_complexpath(path)
+    with path.open("wb") as stream:
+        with pa.ipc.new_file(stream, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_columnar_frame(
+    path: Union[str, ComplexPath], memory_map: bool = True
+) -> Union[pd.DataFrame, pd.Series]:
+    """Reads a DataFrame written with write_columnar_frame.
+
+    Columns are always copied into writable memory, since columns converted
+    from Arrow without a copy are read-only.
+
+    Args:
+        path (Union[str, ComplexPath]): Input file path.
+        memory_map (bool, optional): If True, local files are memory-mapped instead of\
+            read into memory while decoding. Defaults to True.
+
+    Returns:
+        Union[pd.DataFrame, pd.Series]: The stored data.
+    """
+    path = ensure_complexpath(path)
+    if memory_map and not path.iss3f():
+        with pa.memory_map(path.path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    else:
+        with path.open("rb") as stream:
+            table = pa.ipc.open_file(pa.BufferReader(stream.read())).read_all()
+
+    meta = json.loads(table.schema.metadata.get(_PLUMA_METADATA, b"{}"))
+    df = table.to_pandas()
+    for col in meta.get("pickled", []):
+        df[col] = [pickle.loads(x) for x in df[col].values]
+
+    geometry = meta.get("geometry")
+    if geometry is not None:
+        column = geometry["column"]
+        df[column] = gpd.GeoSeries.from_wkb(df[column].values, index=df.index, crs=geometry["crs"])
+        df = gpd.GeoDataFrame(df, geometry=column, crs=geometry["crs"])
+
+    if "__series__" in df.columns:
+        df = df["__series__"].rename(meta["series"])
+    return df
+
+
+def read_columnar_metadata(path: Union[str, ComplexPath]) -> Optional[dict]:
+    """Reads the metadata stored with write_columnar_frame, without reading the data.
+
+    Args:
+        path (Union[str, ComplexPath]): Input file path.
+
+    Returns:
+        Optional[dict]: The stored metadata, or None if no metadata was stored.
+    """
+    path = ensure_complexpath(path)
+    with path.open("rb") as stream:
+        schema = pa.ipc.open_file(stream).schema
+    return json.loads((schema.metadata or {}).get(_PLUMA_METADATA, b"{}")).get("metadata")
+
+
+def write_columnar_array(array: np.ndarray, path: Union[str, ComplexPath]) -> None:
+    """Writes a numeric array to a .npy file.
+
+    Args:
+        array (np.ndarray): Array to be written.
+        path (Union[str, ComplexPath]): Output file path.
+    """
+    path = ensure_complexpath(path)
+    with path.open("wb") as stream:
+        np.save(stream, np.asarray(array), allow_pickle=False)
+
+
+def read_columnar_array(path: Union[str, ComplexPath], memory_map: bool = True) -> np.ndarray:
+    """Reads an array written with write_columnar_array.
+
+    Args:
+        path (Union[str, ComplexPath]): Input file path.
+        memory_map (bool, optional): If True, local files are opened as a copy-on-write\
+            memory-map, so changes to the array are never written back to the file. Defaults to True.
+
+    Returns:
+        np.ndarray: The stored array.
+    """
+    path = ensure_complexpath(path)
+    if memory_map and not path.iss3f():
+        return np.load(path.path, mmap_mode="c", allow_pickle=False)
+    with path.open("rb") as stream:
+        return np.load(io.BytesIO(stream.read()), allow_pickle=False)
+
+
+def write_columnar(obj: Any, root: Union[str, ComplexPath], name: str) -> dict:
+    """Writes an arbitrary stream data object to one or more columnar files.
+
+    DataFrames are written as Arrow IPC files, arrays as .npy files and MNE Raw
+    objects as .fif files. Mappings and sequences are written member by member,
+    and scalars are stored inline in the returned entry. Objects that cannot be
+    represented in any of these forms are pickled.
+
+    Args:
+        obj (Any): Object to be written.
+        root (Union[str, ComplexPath]): Folder where files will be written.
+        name (str): Base name of the written files.
+
+    Returns:
+        dict: JSON serializable entry describing the stored object, to be\
+            used with read_columnar.
+    """
+    root = ensure_complexpath(root)
+    if obj is None:
+        return {"kind": "none"}
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        write_columnar_frame(obj, _join(root, name + _FRAME_EXT))
+        return {"kind": "frame", "file": name + _FRAME_EXT}
+
+    if isinstance(obj, pd.Index):
+        write_columnar_array(obj.values, _join(root, name + _ARRAY_EXT))
+        return {"kind": "array", "file": name + _ARRAY_EXT, "index": True, "name": obj.name}
+
+    if isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+        write_columnar_array(obj, _join(root, name + _ARRAY_EXT))
+        return {"kind": "array", "file": name + _ARRAY_EXT}
+
+    if isinstance(obj, Mapping) and all(isinstance(k, str) for k in obj.keys()):
+        return {
+            "kind": "map",
+            "dotmap": isinstance(obj, DotMap),
+            "items": {key: write_columnar(value, root, f"{name}.{key}") for key, value in obj.items()},
+        }
+
+    if _is_raw(obj):
+        return _write_raw(obj, root, name)
+
+    if isinstance(obj, (list, tuple)):
+        try:
+            values = np.asarray(obj) if len(obj) > 0 else None
+        except ValueError:
+            values = None
+        if values is not None and values.dtype.kind in "biuf":
+            write_columnar_array(values, _join(root, name + _ARRAY_EXT))
+            return {"kind": "array", "file": name + _ARRAY_EXT, "list": isinstance(obj, list)}
+        return {
+            "kind": "sequence",
+            "tuple": isinstance(obj, tuple),
+            "items": [write_columnar(value, root, f"{name}.{i}") for i, value in enumerate(obj)],
+        }
+
+    if isinstance(obj, (bool, int, float, str, np.generic)):
+        return {"kind": "value", "value": obj.item() if isinstance(obj, np.generic) else obj}
+
+    with _join(root, name + _PICKLE_EXT).open("wb") as stream:
+        pickle.dump(obj, stream, protocol=pickle.HIGHEST_PROTOCOL)
+    return {"kind": "pickle", "file": name + _PICKLE_EXT}
+
+
+def read_columnar(entry: dict, root: Union[str, ComplexPath], memory_map: bool = True) -> Any:
+    """Reads an object written with write_columnar.
+
+    Args:
+        entry (dict): Entry returned by write_columnar.
+        root (Union[str, ComplexPath]): Folder where files were written.
+        memory_map (bool, optional): If True, local files are memory-mapped where\
+            possible. Defaults to True.
+
+    Returns:
+        Any: The stored object.
+    """
+    root = ensure_complexpath(root)
+    kind = entry["kind"]
+    if kind == "none":
+        return None
+    elif kind == "value":
+        return entry["value"]
+    elif kind == "frame":
+        return read_columnar_frame(_join(root, entry["file"]), memory_map=memory_map)
+    elif kind == "array":
+        values = read_columnar_array(_join(root, entry["file"]), memory_map=memory_map)
+        if entry.get("index", False):
+            return pd.Index(values, name=entry.get("name"))
+        if "list" in entry:
+            values = values.tolist()
+            return values if entry["list"] else tuple(values)
+        return values
+    elif kind == "map":
+        items = {key: read_columnar(value, root, memory_map) for key, value in entry["items"].items()}
+        return DotMap(items) if entry["dotmap"] else items
+    elif kind == "sequence":
+        items = [read_columnar(value, root, memory_map) for value in entry["items"]]
+        return tuple(items) if entry["tuple"] else items
+    elif kind == "raw":
+        return _read_raw(entry, root, memory_map)
+    elif kind == "pickle":
+        with _join(root, entry["file"]).open("rb") as stream:
+            return pickle.load(stream)
+    else:
+        raise ValueError(f"Unexpected columnar entry kind: {kind}.")
+
+
+def _join(root: ComplexPath, name: str) -> ComplexPath:
+    path = ensure_complexpath(root)
+    path.join(name)
+    return path
+
+
+def _is_raw(obj: Any) -> bool:
+    try:
+        from mne.io import BaseRaw
+    except ImportError:
+        return False
+    return isinstance(obj, BaseRaw)
+
+
+def _write_raw(raw, root: ComplexPath, name: str) -> dict:
+    if root.iss3f():
+        raise NotImplementedError("Writing MNE Raw objects to remote storage is not supported.")
+    fmt = _RAW_FORMATS.get(type(raw).__name__, getattr(raw, "orig_format", "double"))
+    raw.save(os.path.join(root.path, name + _RAW_EXT), fmt=fmt, overwrite=True, verbose="error")
+    attributes = {
+        key: write_columnar(value, root, f"{name}.{key}")
+        for key, value in vars(raw).items()
+        if key.startswith("np_") and key != "np_eeg"
+    }
+    return {"kind": "raw", "file": name + _RAW_EXT, "attributes": attributes}
+
+
+def _read_raw(entry: dict, root: ComplexPath, memory_map: bool):
+    from mne.io import read_raw_fif
+    from pluma.io.eeg import _recover_nepy_attributes
+
+    if root.iss3f():
+        raise NotImplementedError("Reading MNE Raw objects from remote storage is not supported.")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        raw = read_raw_fif(os.path.join(root.path, entry["file"]), preload=not memory_map, verbose="error")
+    attributes = {key: read_columnar(value, root, memory_map) for key, value in entry["attributes"].items()}
+    return _recover_nepy_attributes(raw, **attributes)
@@ -7,6 +7,7 @@ from typing import Union, List, Optional, Tuple
 from sklearn.linear_model import LinearRegression
 
 from pluma.io.harp import to_datetime, to_harptime
+from pluma.io.cache import cached_reader, join_path
 from pluma.io.path_helper import ComplexPath, ensure_complexpath
 
 import mne
@@ -37,8 +38,14 @@ def get_eeg_file(root: Union[str, ComplexPath] = "", if_multiple_load_index: int
     return ret
 
 
+def _eeg_sources(filename: Optional[str], root: Union[str, ComplexPath], **_) -> list:
+    eeg_file = get_eeg_file(root) if filename is None else join_path(root, filename)
+    return [eeg_file, join_path(root, "eeg_markers.csv")]
+
+
+@cached_reader(_eeg_sources)
 def load_eeg(
-    filename: Optional[str] = None, root: Union[str, ComplexPath] = "", **kwargs
+    filename: Optional[str] = None, root: Union[str, ComplexPath] = "", preload: bool = False, **kwargs
 ) -> Tuple[Raw, pd.DataFrame]:
     """_summary_
     Args:
@@ -47,6 +54,9 @@ def load_eeg(
         find the file.
         root (Union[str, ComplexPath], optional): _description_. Defaults to ''.
         Defaults to 'nedf'. Also determines the return type of the function.
+        preload (bool, optional): If True, all samples are read into memory when loading.
+        Otherwise, samples are only read from the file when requested, e.g. by
+        indexing the np_eeg attribute. Defaults to False.
 
     Raises:
         ValueError: Wrong file_extension was given. Must be .nedf.
@@ -67,32 +77,170 @@ def load_eeg(
         root.join(filename)
         filename = root
 
-    _out = read_raw_nedf(filename, **kwargs)
-    _marker_picks = mne.pick_types(_out.info, stim=True, exclude="bads")
-    _eeg_picks = mne.pick_types(_out.info, eeg=True, exclude="bads")
-    _marker_data, _marker_times = _out[_marker_picks]
-    _eeg_data, _ = _out[_eeg_picks]
+    _out = _recover_nepy_attributes(read_raw_nedf(filename, preload=preload, **kwargs))
+
+    _server_lsl_markers = load_server_lsl_markers(root=root)
+    _samples = find_marker_samples(_out.np_markers, _server_lsl_markers["MarkerIdx"].values)
+    _server_lsl_markers["EegSample"] = _samples
+    _server_lsl_markers["EegTimestamp"] = np.where(
+        _samples >= 0, np.asarray(_out.np_time)[np.maximum(_samples, 0)], np.nan
+    )
+
+    return (_out, _server_lsl_markers)
+
+
+def find_marker_samples(markers: np.ndarray, marker_values: np.ndarray) -> np.ndarray:
+    """Finds the first sample of a marker channel where each marker value occurs.
+
+    Args:
+        markers (np.ndarray): Marker channel, with one value per sample.
+        marker_values (np.ndarray): Marker values to be found.
+
+    Returns:
+        np.ndarray: Index of the first sample with each marker value, or -1 if the marker was not found.
+    """
+    markers = np.asarray(markers)
+    marker_values = np.asarray(marker_values)
+    samples = np.full(len(marker_values), -1, dtype=np.int64)
+
+    # all non-zero marker samples are found in a single pass, and the first
+    # occurrence of each value is then looked up with a sorted search
+    nonzero = np.flatnonzero(markers)
+    values, first = np.unique(markers[nonzero], return_index=True)
+    if len(values) > 0:
+        idx = np.minimum(np.searchsorted(values, marker_values), len(values) - 1)
+        found = values[idx] == marker_values
+        samples[found] = nonzero[first[idx[found]]]
+
+    is_zero = marker_values == 0
+    if np.any(is_zero) and len(nonzero) < len(markers):
+        samples[is_zero] = np.argmin(markers != 0)
+    return samples
+
+
+class LazyEegArray:
+    """Read-only, array-like view of the EEG channels of a Raw object,
+    in nepy units (transposed, with one row per sample).
+
+    Samples are only read from the Raw object, or from the file if the Raw
+    object is not preloaded, for the rows and columns being indexed.
+    """
+
+    def __init__(self, raw: Raw, picks: np.ndarray, scale: float = 10e6) -> None:
+        """
+        Args:
+            raw (Raw): Raw object containing the EEG data.
+            picks (np.ndarray): Indices of the EEG channels in the Raw object.
+            scale (float, optional): Scale applied to the data in MNE units (Volts). Defaults to 10e6.
+        """
+        self.raw = raw
+        self.picks = np.asarray(picks)
+        self.scale = scale
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.raw.n_times, len(self.picks))
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float64)
+
+    def __len__(self) -> int:
+        return self.raw.n_times
+
+    def __getitem__(self, key) -> np.ndarray:
+        rows, cols = key if isinstance(key, tuple) else (key, slice(None))
+        picks = self.picks[cols]
+        if np.ndim(picks) == 0:
+            return self[rows, [cols]][..., 0]
+
+        if isinstance(rows, slice):
+            start, stop, step = rows.indices(len(self))
+            if step < 0:
+                return self[np.arange(start, stop, step), cols]
+            return self._read(picks, start, stop)[::step]
+
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        rows = np.where(rows < 0, rows + len(self), rows)
+        if np.any((rows < 0) | (rows >= len(self))):
+            raise IndexError("EEG sample index is out of range.")
+        if rows.size == 0:
+            return np.empty(rows.shape + (len(picks),))
+        start = int(rows.min())
+        return self._read(picks, start, int(rows.max()) + 1)[rows - start]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        data = self._read(self.picks, 0, len(self))
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def _read(self, picks: np.ndarray, start: int, stop: int) -> np.ndarray:
+        if stop <= start:
+            return np.empty((0, len(picks)))
+        return self.raw.get_data(picks=picks, start=start, stop=stop).T * self.scale
+
+
+def _recover_nepy_attributes(
+    raw: Raw, np_markers: Optional[np.ndarray] = None, np_time: Optional[np.ndarray] = None
+) -> Raw:
+    """Adds nepy-like np_eeg, np_markers and np_time attributes to a Raw object.
+    Marker and time arrays are only read from the Raw object if not provided,
+    and np_eeg is a lazy view of the EEG channels."""
+    if np_markers is None:
+        np_markers = _read_markers(raw)
+    if np_time is None:
+        np_time = raw.times.copy()
 
     # recover nepy-like attributes
     # NB: MNE does their own scaling from raw data so numbers are not identical to nepy
     # NB: MNE standardizes measurements in Volts rather than uV and matrix is transposed
-    _out.np_eeg = _eeg_data.T * 10e6
-    _out.np_markers = _marker_data[0]
-    _out.np_time = _marker_times
+    raw.np_eeg = LazyEegArray(raw, mne.pick_types(raw.info, eeg=True, exclude="bads"))
+    raw.np_markers = np_markers
+    raw.np_time = np_time
+    return raw
 
-    _server_lsl_markers = load_server_lsl_markers(root=root)
-    _server_lsl_markers["EegSample"] = -1
-    _server_lsl_markers["EegTimestamp"] = np.nan
 
-    _server_lsl_markers["EegSample"] = [
-        (np.where(_out.np_markers == marker)[0][0]) if marker in _out.np_markers else -1
-        for marker in _server_lsl_markers["MarkerIdx"].values
-    ]
-    _server_lsl_markers["EegTimestamp"] = [
-        _out.np_time[sample] if sample != -1 else np.nan for sample in _server_lsl_markers["EegSample"].values
-    ]
+def _read_markers(raw: Raw) -> np.ndarray:
+    """Reads the marker channel of a Raw object. If the samples of a NEDF file are not
+    loaded, the trigger field is read directly from the file without decoding EEG channels."""
+    if not raw.preload:
+        try:
+            markers = _read_nedf_markers(raw)
+        except (ImportError, KeyError, ValueError):
+            # the NEDF reader internals changed, so markers are read through the public API
+            markers = None
+        if markers is not None:
+            return markers
 
-    return (_out, _server_lsl_markers)
+    _marker_picks = mne.pick_types(raw.info, stim=True, exclude="bads")
+    return raw.get_data(picks=_marker_picks[:1])[0]
+
+
+def _read_nedf_markers(raw: Raw) -> Optional[np.ndarray]:
+    """Memory-maps the trigger field of the records of a NEDF file, using the record
+    layout parsed by the MNE reader. Returns None if raw was not read from a NEDF file."""
+    from mne.io.nedf.nedf import RawNedf, _HDRLEN
+
+    if not isinstance(raw, RawNedf):
+        return None
+    extras = raw._raw_extras[0]
+    filename = raw.filenames[0]
+    records = np.memmap(filename, dtype=extras["dt"], mode="r", offset=_HDRLEN, shape=(extras["n_full"],))
+    markers = [records["data"]["trig"].reshape(-1)]
+    if raw.n_times > extras["n_full"] * 5:
+        last = np.memmap(
+            filename, dtype=extras["dt_last"], mode="r", offset=_HDRLEN + records.nbytes, shape=(1,)
+        )
+        markers.append(last["data"]["trig"].reshape(-1))
+    markers = np.concatenate(markers).astype(np.float64)
+    if len(markers) != raw.n_times:
+        raise ValueError(f"NEDF file {filename} has {len(markers)} trigger samples, expected {raw.n_times}.")
+    return markers
 
 
 def load_server_lsl_markers(
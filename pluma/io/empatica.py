@@ -1,21 +1,37 @@
 import warnings
 import datetime
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from dotmap import DotMap
 from typing import Sequence, Union
 from numpy.typing import ArrayLike
 
 from pluma.io.harp import to_datetime
+from pluma.io.cache import cached_reader, join_path
 from pluma.io.path_helper import ComplexPath, ensure_complexpath
 
 _EMPATICA_T0 = datetime.datetime(1970, 1, 1)
 
+_EMPATICA_ACC_STREAMS = ["E4_Acc"]
+_EMPATICA_VALUE_STREAMS = [
+    "E4_Hr",
+    "E4_Bvp",
+    "E4_Gsr",
+    "E4_Battery",
+    "E4_Ibi",
+    "E4_Tag",
+    "E4_Temperature",
+]
+
 
 def _E4_to_datetime(seconds: Union[float, ArrayLike, Sequence[float]]) -> datetime:
     return _EMPATICA_T0 + pd.to_timedelta(seconds, "s")
 
 
+@cached_reader(lambda filename, root, **_: [join_path(root, filename)])
 def load_empatica(
     filename: str = "empatica_harp_ts.csv",
     root: Union[str, ComplexPath] = "",
@@ -44,19 +60,32 @@ def load_empatica(
         warnings.warn(f"Empatica stream file {filename} could not be found.")
         return
 
+    # messages are tokenized only once, and all numeric fields
+    # are parsed with vectorized arrow compute kernels
+    index = pd.DatetimeIndex(to_datetime(df["Timestamp"].values), name="Timestamp")
+    messages = pa.array(df["Message"].values, type=pa.string(), from_pandas=True)
+    stream_ids = pc.list_element(pc.split_pattern(messages, " ", max_splits=1), 0).dictionary_encode()
+    labels = stream_ids.dictionary.to_pylist()
+    codes = stream_ids.indices.to_numpy(zero_copy_only=False)
+
     clock_offset = None
-    df["Timestamp"] = to_datetime(df["Timestamp"].values)
     if align_timestamps:
-        first_ts = next((x for _, x in df.iterrows() if x["Message"].startswith("E4_")), None)
-        if first_ts is not None:
-            reference_ts = _E4_to_datetime(float(first_ts["Message"].split(" ")[1]))
-            clock_offset = first_ts["Timestamp"] - reference_ts
-
-    df.set_index("Timestamp", inplace=True)
-    df["StreamId"] = df["Message"].apply(lambda x: x.split(" ")[0])
+        is_e4 = np.isin(codes, [i for i, label in enumerate(labels) if label.startswith("E4_")])
+        if np.any(is_e4):
+            first = int(np.argmax(is_e4))
+            reference_ts = _E4_to_datetime(float(messages[first].as_py().split(" ")[1]))
+            clock_offset = index[first] - reference_ts
+
+    # partition rows by stream id with a single stable sort, preserving file order within each stream
+    order = np.argsort(codes, kind="stable")
+    categories = pd.CategoricalDtype(sorted(labels))
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(labels)))])
     _dict = {}
-    for label, group in df.groupby("StreamId"):
-        _dict[label] = parse_empatica_stream(group, clock_offset)
+    for code in np.argsort(labels):
+        rows = order[bounds[code] : bounds[code + 1]]
+        _dict[labels[code]] = _parse_empatica_messages(
+            labels[code], messages.take(pa.array(rows)), index[rows], clock_offset, categories
+        )
     return DotMap(_dict)
 
 
@@ -70,39 +99,58 @@ def parse_empatica_stream(empatica_stream: pd.DataFrame, clock_offset: pd.Timede
     Returns:
         pd.DataFrame: A DataFrame with parsed relevant empatica data indexed by time.
     """
-    stream_id = empatica_stream["Message"][0].split(" ")[0]
-    if stream_id == "E4_Acc":
-        df = empatica_stream["Message"].str.split(pat=" ", expand=True)
+    stream_id = empatica_stream["Message"].iloc[0].split(" ")[0]
+    messages = pa.array(empatica_stream["Message"].values, type=pa.string(), from_pandas=True)
+    return _parse_empatica_messages(stream_id, messages, empatica_stream.index, clock_offset)
+
+
+def _parse_empatica_messages(
+    stream_id: str,
+    messages: pa.Array,
+    index: pd.Index,
+    clock_offset: pd.Timedelta = None,
+    categories: pd.CategoricalDtype = None,
+) -> pd.DataFrame:
+    # stream ids share a single dictionary across all streams of a file, so
+    # each row stores only a small integer code and streams concatenate cleanly
+    if categories is None:
+        categories = pd.CategoricalDtype([stream_id])
+    stream_codes = np.full(len(messages), categories.categories.get_loc(stream_id), dtype=np.int32)
+    stream_labels = pd.Categorical.from_codes(stream_codes, dtype=categories)
+
+    if stream_id in _EMPATICA_ACC_STREAMS:
         df_labels = ["Stream", "E4_Timestamp", "AccX", "AccY", "AccZ"]
-        df.columns = df_labels
-        df[["AccX", "AccY", "AccZ"]] = df[["AccX", "AccY", "AccZ"]].astype(float)
-        df["E4_Timestamp"] = _E4_to_datetime(df["E4_Timestamp"].values.astype(float))
-        if clock_offset is not None:
-            df.index = pd.DatetimeIndex(df["E4_Timestamp"] + clock_offset, name=df.index.name)
-
-    elif stream_id in [
-        "E4_Hr",
-        "E4_Bvp",
-        "E4_Gsr",
-        "E4_Battery",
-        "E4_Ibi",
-        "E4_Tag",
-        "E4_Temperature",
-    ]:
-        df = empatica_stream["Message"].str.split(pat=" ", expand=True)
+    elif stream_id in _EMPATICA_VALUE_STREAMS:
         df_labels = ["Stream", "E4_Timestamp", "Value"]
-        df.columns = df_labels
-        df[["Value"]] = df[["Value"]].astype(float)
-        df["E4_Timestamp"] = _E4_to_datetime(df["E4_Timestamp"].values.astype(float))
-        if clock_offset is not None:
-            df.index = pd.DatetimeIndex(df["E4_Timestamp"] + clock_offset, name=df.index.name)
     elif stream_id == "R":
-        df = pd.DataFrame(index=empatica_stream.index.copy())
-        df["Message"] = empatica_stream["Message"].apply(lambda a: a[2:])
-        df["StreamId"] = empatica_stream["Message"].apply(lambda x: x.split(" ")[0])
+        df = pd.DataFrame(index=index.copy())
+        df["Message"] = pc.utf8_slice_codeunits(messages, 2).to_numpy(zero_copy_only=False)
+        df["StreamId"] = stream_labels
+        return df
     else:
-        raise (
-            f"Unexpected empatica stream id label: {stream_id}.\
-            No parse is currently set."
-        )
+        raise ValueError(f"Unexpected empatica stream id label: {stream_id}. No parse is currently set.")
+
+    # all messages of a stream are split into a flat array of tokens, and the numeric
+    # tokens are gathered into a (messages x fields) table with a single cast
+    tokens = pc.split_pattern(messages, " ", max_splits=len(df_labels) - 1)
+    n_tokens = pc.list_value_length(tokens).to_numpy(zero_copy_only=False)
+    n_fields = len(df_labels) - 1
+    if np.any(n_tokens < 2) or np.any(n_tokens > len(df_labels)):
+        raise ValueError(f"Unexpected number of fields in empatica stream {stream_id}.")
+    offsets = tokens.offsets.to_numpy()[:-1] - tokens.offsets[0].as_py()
+    fields = np.arange(1, len(df_labels))
+    valid = fields[np.newaxis, :] < n_tokens[:, np.newaxis]
+    take = (offsets[:, np.newaxis] + fields[np.newaxis, :])[valid]
+    values = np.full((len(messages), n_fields), np.nan)
+    values[valid] = pc.cast(tokens.flatten().take(pa.array(take)), pa.float64()).to_numpy(
+        zero_copy_only=False
+    )
+
+    df = pd.DataFrame(index=index.copy())
+    df["Stream"] = stream_labels
+    df["E4_Timestamp"] = _E4_to_datetime(values[:, 0])
+    for i, label in enumerate(df_labels[2:], start=1):
+        df[label] = values[:, i]
+    if clock_offset is not None:
+        df.index = pd.DatetimeIndex(df["E4_Timestamp"] + clock_offset, name=df.index.name)
     return df
@@ -4,6 +4,7 @@ from datetime import datetime
 import numpy as np
 import pandas as pd
 
+from pluma.io.cache import cached_reader
 from pluma.io.path_helper import ComplexPath, ensure_complexpath
 from typing import Sequence, Union
 
@@ -63,6 +64,7 @@ def to_harptime(
     return (datetime - np.datetime64(_HARP_T0)) / np.timedelta64(1, "s")
 
 
+@cached_reader(lambda file, **_: [file])
 def read_harp_bin(file: Union[str, ComplexPath], time_offset: float = 0) -> pd.DataFrame:
     """Reads data from the specified Harp binary file. \
         Expects a stable message format.
@@ -1,3 +1,4 @@
+import os
 import warnings
 import numpy as np
 
@@ -10,6 +11,7 @@ def load_microphone(
     channels: int = 2,
     root: Union[str, ComplexPath] = "",
     dtype=np.int16,
+    memmap: bool = True,
 ) -> np.array:
     """Loads microphone waveform data from a file into a numpy array.
 
@@ -19,20 +21,32 @@ def load_microphone(
         root (Union[str, ComplexPath], optional): Root path\
             where filename is expected to be found. Defaults to ''.
         dtype (_type_, optional): Data type of the binary file. Defaults to np.int16.
+        memmap (bool, optional): If True, local files are opened as a read-only memory-map\
+            instead of being read into memory. Defaults to True.
 
     Returns:
-        np.array: Array with raw waveform data from the microphone stream.
+        np.array: Array with raw waveform data from the microphone stream,\
+            with one row per sample and one column per channel.
     """
 
     path = ensure_complexpath(root)
     path.join(filename)
 
     try:
-        with path.open("rb") as stream:
-            micdata = np.frombuffer(stream.read(), dtype=dtype)
-            micdata = micdata.reshape((-1, channels))
+        if memmap and not path.iss3f():
+            frame_size = np.dtype(dtype).itemsize * channels
+            n_samples = os.path.getsize(path.path) // frame_size
+            if n_samples == 0:
+                return np.empty((0, channels), dtype=dtype)
+            micdata = np.memmap(path.path, dtype=dtype, mode="r", shape=(n_samples, channels))
+        else:
+            with path.open("rb") as stream:
+                micdata = np.frombuffer(stream.read(), dtype=dtype)
+                micdata = micdata.reshape((-1, channels))
     except FileNotFoundError:
         warnings.warn(f"Microphone stream file {path} could not be found.")
+        return
     except FileExistsError:
         warnings.warn(f"Microphone stream file {path} could not be found.")
+        return
     return micdata
@@ -1,11 +1,13 @@
 import warnings
 
+import numpy as np
 import pyubx2 as ubx
 import pandas as pd
 
 from enum import Enum
 from typing import Union
 
+from pluma.io.cache import cached_reader
 from pluma.io.path_helper import ComplexPath, ensure_complexpath
 from pluma.io.harp import to_datetime
 
@@ -46,6 +48,7 @@ def load_ubx_bin_event(
     return read_ubx_file(root)
 
 
+@cached_reader(lambda path: [path])
 def read_ubx_file(path: Union[str, ComplexPath]) -> pd.DataFrame:
     """Outputs a dataframe with all messages\
         from single UBX binary file.
@@ -69,13 +72,23 @@ def read_ubx_file(path: Union[str, ComplexPath]) -> pd.DataFrame:
         return pd.DataFrame()
 
     df = pd.DataFrame({"Message": out})
-    df["Identity"] = df["Message"].apply(lambda x: x.identity)
-    df["Class"] = df["Message"].apply(lambda x: x.identity.split("-")[0])
-    df["Id"] = df["Message"].apply(lambda x: x.identity.split("-")[1])
-    df["Length"] = df["Message"].apply(lambda x: x.length)
+    identity = pd.Categorical([x.identity for x in out])
+    parts = identity.categories.str.split("-", n=1)
+    df["Identity"] = identity
+    df["Class"] = _recode(identity, parts.str[0])
+    df["Id"] = _recode(identity, parts.str[1])
+    df["Length"] = np.fromiter((x.length for x in out), dtype=np.int64, count=len(out))
     return df
 
 
+def _recode(values: pd.Categorical, labels: pd.Index) -> pd.Categorical:
+    """Maps each category of values to a new label, such that
+    only the distinct labels are computed and stored."""
+    categories, label_codes = np.unique(labels.values.astype(str), return_inverse=True)
+    codes = np.where(values.codes < 0, -1, label_codes[values.codes])
+    return pd.Categorical.from_codes(codes, categories.astype(object))
+
+
 def load_ubx_harp_ts_event(
     root: Union[str, ComplexPath],
     ubxmsgid: _UBX_MSGIDS,
@@ -102,6 +115,7 @@ def load_ubx_harp_ts_event(
     return load_ubx_harp_ts(root)
 
 
+@cached_reader(lambda path: [path])
 def load_ubx_harp_ts(path: Union[str, ComplexPath] = "") -> pd.DataFrame:
     """Reads the software timestamped data of all UBX messages in a single\
         .csv file.
@@ -116,7 +130,12 @@ def load_ubx_harp_ts(path: Union[str, ComplexPath] = "") -> pd.DataFrame:
     path = ensure_complexpath(path)
     try:
         with path.open("rb") as stream:
-            df = pd.read_csv(stream, header=None, names=("Timestamp", "Class", "Identity"))
+            df = pd.read_csv(
+                stream,
+                header=None,
+                names=("Timestamp", "Class", "Identity"),
+                dtype={"Class": "category", "Identity": "category"},
+            )
     except FileNotFoundError:
         warnings.warn(f"UBX stream alignment file {path} could not be found.")
         return
@@ -151,7 +170,7 @@ def load_ubx_event_stream(
     root = ensure_complexpath(root)
     bin_file = load_ubx_bin_event(ubxmsgid=ubxmsgid, root=root, ubxfolder=ubxfolder)
     csv_file = load_ubx_harp_ts_event(ubxmsgid=ubxmsgid, root=root, ubxfolder=ubxfolder)
-    if (bin_file["Class"].values == csv_file["Class"].values).all():
+    if _equal_categorical(bin_file["Class"], csv_file["Class"]):
         bin_file["Timestamp"] = csv_file.index
         bin_file = bin_file.set_index("Timestamp")
         return bin_file
@@ -159,6 +178,21 @@ def load_ubx_event_stream(
         raise ValueError("Misalignment found between CSV and UBX arrays.")
 
 
+def _equal_categorical(left: pd.Series, right: pd.Series) -> bool:
+    """Compares two series of labels element-wise on their integer
+    codes, after mapping both to a shared set of categories."""
+    if len(left) != len(right):
+        return False
+    left, right = pd.Categorical(left), pd.Categorical(right)
+    categories = left.categories.astype(str).union(right.categories.astype(str))
+    return bool(np.array_equal(_shared_codes(left, categories), _shared_codes(right, categories)))
+
+
+def _shared_codes(values: pd.Categorical, categories: pd.Index) -> np.ndarray:
+    mapping = np.append(categories.get_indexer(values.categories.astype(str)), -1)
+    return mapping[values.codes]
+
+
 def errhandler(err):
     """
     Handles errors output by iterator.
@@ -1,7 +1,8 @@
+import os
 import warnings
 import numpy as np
 
-from typing import Union
+from typing import Optional, Union
 
 import pandas as pd
 from pluma.io.path_helper import ComplexPath, ensure_complexpath
@@ -11,22 +12,107 @@ def load_zeromq(
     filenames: list[str],
     dtypes: list[tuple[str, type]],
     root: Union[str, ComplexPath] = "",
+    index: Optional[pd.Index] = None,
 ) -> pd.DataFrame:
+    """Loads the frames of a ZeroMQ multipart message stream into a single DataFrame.
+
+    Each frame file is memory-mapped with its structured dtype and every field becomes
+    a column backed by the file, so numeric fields are never copied. Frames are aligned
+    by position, i.e. the nth record of every frame file belongs to the nth message.
+
+    Args:
+        filenames (list[str]): Frame file names, relative to root.
+        dtypes (list[tuple[str, type]]): Structured dtype of each frame file. Frames\
+            with a None dtype are skipped.
+        root (Union[str, ComplexPath], optional): Root path where the files are expected\
+            to be found. Defaults to ''.
+        index (Optional[pd.Index], optional): Index of the messages, e.g. the harp timestamp\
+            of each message. If the number of messages differs from the length of the index,\
+            a warning is raised and messages are aligned by position. If None, a RangeIndex\
+            is used. Defaults to None.
+
+    Returns:
+        pd.DataFrame: DataFrame with one column per frame field. Fixed-length byte string\
+            fields are returned as categorical columns.
+    """
     assert len(filenames) == len(dtypes), "Length of filename and dtypes must be the same."
 
-    try:
-        data_frames = []
-        for i, f in enumerate(filenames):
-            if dtypes[i] is None:
-                continue
+    frames = []
+    for i, f in enumerate(filenames):
+        if dtypes[i] is None:
+            continue
+
+        path = ensure_complexpath(root)
+        path.join(f)
+        try:
+            frames.append(_map_frame(path, np.dtype(dtypes[i])))
+        except FileNotFoundError:
+            warnings.warn(f"Stream file {path} could not be found.")
+            return
+        except FileExistsError:
+            warnings.warn(f"Stream file {path} could not be found.")
+            return
+
+    counts = [len(frame) for frame in frames]
+    n_messages = len(index) if index is not None else max(counts, default=0)
+    if any(count != n_messages for count in counts):
+        warnings.warn(
+            f"Number of records in frame files {counts} does not match the number of messages ({n_messages})."
+        )
+
+    columns = {}
+    for frame in frames:
+        for name in frame.dtype.names:
+            values = np.asarray(frame[name])[:n_messages]
+            if values.dtype.kind == "S":
+                # repeated identifiers are stored once, with integer codes per message
+                categories, codes = np.unique(values, return_inverse=True)
+                values = pd.Categorical.from_codes(codes, categories.astype(object))
+            columns[name] = values
 
-            path = ensure_complexpath(root)
-            path.join(f)
+    if all(count >= n_messages for count in counts):
+        return pd.DataFrame(
+            columns, index=index if index is not None else pd.RangeIndex(n_messages), copy=False
+        )
 
-            data_frames.append(pd.DataFrame(np.fromfile(path.path, dtype=np.dtype(dtypes[i]))))
+    # only if some frames are missing records are columns copied and padded with NaN
+    data = pd.DataFrame({name: pd.Series(values, copy=False) for name, values in columns.items()})
+    data = data.reindex(pd.RangeIndex(n_messages))
+    if index is not None:
+        data.index = index
+    return data
+
+
+def load_zeromq_payload(filename: str, root: Union[str, ComplexPath] = "") -> Optional[np.ndarray]:
+    """Memory-maps a variable-length ZeroMQ frame file as a flat byte buffer.
+
+    Args:
+        filename (str): Frame file name, relative to root.
+        root (Union[str, ComplexPath], optional): Root path where the file is expected\
+            to be found. Defaults to ''.
+
+    Returns:
+        Optional[np.ndarray]: Read-only uint8 buffer with the contents of the file,\
+            or None if the file could not be found.
+    """
+    path = ensure_complexpath(root)
+    path.join(filename)
+    try:
+        return _map_frame(path, np.dtype(np.uint8))
     except FileNotFoundError:
         warnings.warn(f"Stream file {path} could not be found.")
+        return
     except FileExistsError:
         warnings.warn(f"Stream file {path} could not be found.")
+        return
+
+
+def _map_frame(path: ComplexPath, dtype: np.dtype) -> np.ndarray:
+    if path.iss3f():
+        with path.open("rb") as stream:
+            return np.frombuffer(stream.read(), dtype=dtype)
 
-    return pd.concat(data_frames, axis=1)
+    n_records = os.path.getsize(path.path) // dtype.itemsize
+    if n_records == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path.path, dtype=dtype, mode="r", shape=(n_records,))
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from typing import Optional, Sequence
+from numpy.lib.stride_tricks import sliding_window_view
+
+OCTAVE_BAND_CENTERS = (31.5, 63, 125, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+def a_weighting(frequencies: np.ndarray) -> np.ndarray:
+    """Computes the linear amplitude gain of the IEC 61672 A-weighting curve.
+
+    Args:
+        frequencies (np.ndarray): Frequencies, in Hz.
+
+    Returns:
+        np.ndarray: Linear amplitude gain at each frequency, normalized to unity at 1 kHz.
+    """
+    f2 = np.asarray(frequencies, dtype=np.float64) ** 2
+    ra = (12194.0**2 * f2**2) / (
+        (f2 + 20.6**2) * np.sqrt((f2 + 107.7**2) * (f2 + 737.9**2)) * (f2 + 12194.0**2)
+    )
+    return ra * 10 ** (2.0 / 20)
+
+
+def compute_acoustic_features(
+    audio: np.ndarray,
+    fs: float,
+    window_size: int,
+    hop_size: Optional[int] = None,
+    octave_bands: Optional[Sequence[float]] = OCTAVE_BAND_CENTERS,
+    full_scale: float = 32768.0,
+    calibration_offset: float = 0.0,
+    chunk_samples: int = 2**20,
+) -> pd.DataFrame:
+    """Computes per-window acoustic levels over an audio signal, processing a
+    fixed number of windows at a time so memory use does not depend on the
+    length of the signal. Memory-mapped inputs are never loaded in full.
+
+    For each channel, the following levels are computed, in dB relative to
+    full scale plus calibration_offset:
+
+    - Rms: unweighted level, from the root mean square of the samples.
+    - LA: A-weighted level (IEC 61672), from the Hann-windowed spectrum.
+    - Octave{fc}Hz: energy level of each octave band with center frequency fc.
+
+    Args:
+        audio (np.ndarray): Audio samples, with one row per sample and one column per channel.
+        fs (float): Sampling rate, in Hz.
+        window_size (int): Number of samples in each analysis window.
+        hop_size (Optional[int], optional): Number of samples between the start of consecutive\
+            windows. Windows overlap if hop_size is smaller than window_size. If None,\
+            defaults to window_size.
+        octave_bands (Optional[Sequence[float]], optional): Octave band center frequencies, in Hz.\
+            Bands above the Nyquist frequency are ignored. If None, band levels are not\
+            computed. Defaults to the standard octave bands from 31.5 Hz to 16 kHz.
+        full_scale (float, optional): Sample amplitude corresponding to 0 dBFS. Defaults to 32768.
+        calibration_offset (float, optional): Offset added to all levels, in dB, e.g. to convert\
+            dBFS to dB SPL given the microphone sensitivity. Defaults to 0.
+        chunk_samples (int, optional): Approximate number of samples per channel processed at a time,\
+            which bounds memory use. Defaults to 2**20.
+
+    Returns:
+        pd.DataFrame: Levels for each window, indexed by the sample at the center of the window.
+    """
+    if audio.ndim == 1:
+        audio = audio[:, np.newaxis]
+    hop_size = window_size if hop_size is None else hop_size
+    n_channels = audio.shape[1]
+    n_windows = max(0, (len(audio) - window_size) // hop_size + 1)
+    chunk_size = max(1, chunk_samples // window_size)
+
+    # spectral weights are precomputed once for all windows, such that
+    # weights @ |X|^2 gives the mean square of each weighted band
+    taper = np.hanning(window_size)
+    frequencies = np.fft.rfftfreq(window_size, d=1.0 / fs)
+    parseval = np.full(len(frequencies), 2.0)
+    parseval[0] = 1.0
+    if window_size % 2 == 0:
+        parseval[-1] = 1.0
+    parseval /= window_size * np.sum(taper**2)
+
+    labels = ["LA"]
+    weights = [parseval * a_weighting(frequencies) ** 2]
+    for fc in [] if octave_bands is None else octave_bands:
+        upper = fc * np.sqrt(2)
+        if upper > fs / 2:
+            continue
+        labels.append(f"Octave{fc:g}Hz")
+        weights.append(parseval * ((frequencies >= fc / np.sqrt(2)) & (frequencies < upper)))
+    weights = np.stack(weights, axis=1)
+
+    rms = np.empty((n_windows, n_channels))
+    spectral = np.empty((n_windows, n_channels, len(labels)))
+    for first in range(0, n_windows, chunk_size):
+        last = min(first + chunk_size, n_windows)
+        block = np.asarray(audio[first * hop_size : (last - 1) * hop_size + window_size], dtype=np.float64)
+        frames = sliding_window_view(block, window_size, axis=0)[::hop_size]
+        rms[first:last] = np.sqrt(np.mean(frames**2, axis=-1))
+        power = np.abs(np.fft.rfft(frames * taper, axis=-1)) ** 2
+        spectral[first:last] = power @ weights
+
+    with np.errstate(divide="ignore"):
+        levels = {}
+        for channel in range(n_channels):
+            levels[f"Rms_Ch{channel}"] = 20 * np.log10(rms[:, channel] / full_scale)
+            for i, label in enumerate(labels):
+                levels[f"{label}_Ch{channel}"] = 10 * np.log10(spectral[:, channel, i] / full_scale**2)
+
+    index = pd.Index(np.arange(n_windows) * hop_size + window_size // 2, name="Sample")
+    return pd.DataFrame(levels, index=index) + calibration_offset
@@ -1,7 +1,12 @@
+import os
 import numpy as np
 import pandas as pd
 import heartpy as hp
-from typing import Union
+from concurrent.futures import ProcessPoolExecutor
+from scipy.ndimage import uniform_filter1d
+from scipy.signal import butter, find_peaks, resample_poly, sosfiltfilt
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Optional, Union
 from pluma.stream import Stream
 
 
@@ -13,6 +18,8 @@ def heartrate_from_ecg(
     highpass_cutoff: float = 5,
     invert: bool = False,
     bpm_method: str = "heartpy",
+    decimation: str = "slice",
+    detector: str = "heartpy",
 ) -> tuple:
     ## Load biodata
     """Calculates heart rate from the raw ECG waveform signal
@@ -25,6 +32,10 @@ def heartrate_from_ecg(
         highpass_cutoff (float, optional): Cutoff frequency of the high-pass filter (Hz). Defaults to 5.
         segment_width (int, optional): Segment window size (in seconds) over which to compute heartrate. Defaults to 5.
         invert (bool, optional): If True, it will invert the raw signal (i.e. Signal * -1 ). Defaults to False.
+        decimation (str, optional): Either 'slice', to keep every skip_slice sample, or 'polyphase',\
+            to low-pass filter the signal before downsampling. Defaults to 'slice'.
+        detector (str, optional): R-peak detector, either 'heartpy' or 'numpy'. See find_rpeaks.\
+            Defaults to 'heartpy'.
 
     Returns:
         tuple: Tuple with a DataFrame containing timestamped heartbeats, an array with
@@ -38,13 +49,13 @@ def heartrate_from_ecg(
         ecg = ecg * (-1.0)
 
     # sensor acquires at 50hz but is sampled at 1khz
-    ecg = ecg.Value0[::skip_slice].astype(np.float64)
+    ecg = _decimate(ecg.Value0, skip_slice, decimation)
 
     # high-pass filter seems to give consistently less rejected peaks than notch
     filtered = hp.filter_signal(ecg, cutoff=highpass_cutoff, sample_rate=sample_rate, filtertype="highpass")
 
     # find peaks and compute overall beat statistics
-    working_data, measures = hp.process(filtered, sample_rate=sample_rate, bpmmax=bpmmax)
+    working_data, measures = _detect_peaks(filtered, sample_rate, bpmmax, detector)
 
     if bpm_method == "heartpy":
         heartrate = 60000 / np.array(working_data["RR_list_cor"])
@@ -65,3 +76,261 @@ def heartrate_from_ecg(
     bpm = pd.DataFrame(index=peak_index, copy=True)
     bpm["Bpm"] = heartrate
     return (bpm, filtered, working_data, measures)
+
+
+def heartrate_from_ecg_chunked(
+    ecg: Union[Stream, pd.DataFrame],
+    sample_rate: float = 50,
+    skip_slice: int = 20,
+    bpmmax: float = 200.0,
+    highpass_cutoff: float = 5,
+    invert: bool = False,
+    bpm_method: str = "heartpy",
+    segment_duration: float = 600.0,
+    overlap: float = 10.0,
+    n_jobs: Optional[int] = 1,
+    detector: str = "heartpy",
+) -> tuple:
+    """Calculates heart rate from the raw ECG waveform signal, processing
+    overlapping segments of the signal, optionally in parallel.
+
+    Each segment is decimated with a polyphase anti-aliasing filter, high-pass
+    filtered and passed to heartpy for peak detection. Only the peaks and filtered
+    samples in the central part of each segment are kept, so filter transients at
+    segment edges are discarded and peaks in the overlaps are never duplicated.
+    Outlier beats are then rejected, and heart rate computed, from the stitched
+    peaks as in heartrate_from_ecg.
+
+    With detector='numpy', results are identical to heartrate_from_ecg with
+    decimation='polyphase'. With detector='heartpy', peak detection thresholds
+    are fitted to each segment, so a few peaks may differ from a single pass.
+
+    Args:
+        ecg_data (Stream or DataFrame): ECG input data
+        sample_rate (float, optional): ECG sampling rate (Hz). Defaults to 50.
+        skip_slice (int, optional): Downsampling factor of the incoming raw array. Fs corresponds to the sampling rate post-decimation. Defaults to 20.
+        bpmmax (float, optional): Maximum theoretical heartrate. Defaults to 200.0.
+        highpass_cutoff (float, optional): Cutoff frequency of the high-pass filter (Hz). Defaults to 5.
+        invert (bool, optional): If True, it will invert the raw signal (i.e. Signal * -1 ). Defaults to False.
+        bpm_method (str, optional): Either 'heartpy' or 'rolling'. See heartrate_from_ecg. Defaults to 'heartpy'.
+        segment_duration (float, optional): Duration of each segment, excluding overlaps (s). Defaults to 600.
+        overlap (float, optional): Duration of the signal added to each side of a segment (s). Defaults to 10.
+        n_jobs (Optional[int], optional): Number of worker processes. If 1, segments are processed\
+            sequentially in the calling process. If None, one worker per CPU is used. On platforms\
+            where worker processes are spawned (Windows, macOS), scripts running more than one job\
+            must call this function under an `if __name__ == "__main__":` guard. Defaults to 1.
+        detector (str, optional): R-peak detector, either 'heartpy' or 'numpy'. Defaults to 'heartpy'.
+
+    Returns:
+        tuple: Tuple with a DataFrame containing timestamped heartbeats, an array with
+        the processed waveform signal, and the stitched peak working_data and measures, respectively.
+    """
+
+    if isinstance(ecg, Stream):
+        ecg = ecg.data
+
+    raw = ecg.Value0.values.astype(np.float64)
+    if invert:
+        raw = raw * (-1.0)
+    index = ecg.index[::skip_slice]
+
+    segment_size = int(round(segment_duration * sample_rate))
+    overlap_size = int(round(overlap * sample_rate))
+    if segment_size <= 0:
+        raise ValueError("segment_duration must be longer than one sample.")
+
+    segments = []
+    for start in range(0, len(index), segment_size):
+        stop = min(start + segment_size, len(index))
+        padded_start = max(0, start - overlap_size)
+        padded_stop = min(len(index), stop + overlap_size)
+        segments.append((start, stop, padded_start, padded_stop))
+
+    def _jobs():
+        for _, _, padded_start, padded_stop in segments:
+            yield (
+                raw[padded_start * skip_slice : padded_stop * skip_slice],
+                skip_slice,
+                sample_rate,
+                bpmmax,
+                highpass_cutoff,
+                detector,
+            )
+
+    n_jobs = os.cpu_count() if n_jobs is None else n_jobs
+    if n_jobs == 1 or len(segments) == 1:
+        results = [_process_ecg_segment(*job) for job in _jobs()]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(segments))) as pool:
+            results = list(pool.map(_process_ecg_segment, *zip(*_jobs())))
+
+    # keep only the samples and peaks detected in the central part of each segment
+    filtered = np.empty(len(index))
+    peaklist = []
+    for (start, stop, padded_start, _), (segment, peaks) in zip(segments, results):
+        filtered[start:stop] = segment[start - padded_start : stop - padded_start]
+        peaks = peaks + padded_start
+        core = (peaks >= start) & (peaks < stop)
+        peaklist.append(peaks[core])
+    peaklist = np.concatenate(peaklist)
+
+    # outlier beats are rejected against the mean RR interval of the whole signal, as in a single pass
+    binary_peaklist = _reject_rr_outliers(peaklist, sample_rate)
+
+    working_data = _update_rr({"peaklist": peaklist, "binary_peaklist": binary_peaklist}, sample_rate)
+    measures = _rr_measures(working_data["RR_list_cor"])
+    rr_list_cor, rr_mask = working_data["RR_list_cor"], working_data["RR_masklist"]
+
+    if bpm_method == "heartpy":
+        heartrate = np.clip(60000 / rr_list_cor, None, bpmmax)
+        peak_index = index[peaklist[1:][rr_mask == 0]]
+    elif bpm_method == "rolling":
+        peak_index = index[peaklist]
+        ibi = peak_index.to_series().diff().dt.total_seconds()
+        heartrate = 60 / ibi.rolling(window=pd.to_timedelta(60, "s")).mean()
+        heartrate = heartrate.clip(None, bpmmax)
+    else:
+        raise ValueError("The specified heartrate calculation method is not supported.")
+
+    filtered = pd.DataFrame(filtered, index=index, columns=["Ecg"])
+    bpm = pd.DataFrame(index=peak_index, copy=True)
+    bpm["Bpm"] = heartrate
+    return (bpm, filtered, working_data, measures)
+
+
+def find_rpeaks(
+    signal: np.ndarray,
+    sample_rate: float,
+    bpmmax: float = 200.0,
+    band: tuple = (5.0, 15.0),
+    envelope_width: float = 0.1,
+    threshold_width: float = 2.0,
+    threshold_scale: float = 1.5,
+    search_width: float = 0.05,
+) -> tuple:
+    """Detects R-peaks in an ECG waveform with vectorized filters, as a
+    faster alternative to heartpy peak fitting.
+
+    The signal is band-passed with a zero-phase Butterworth filter and squared, and its
+    moving average is used as the QRS energy envelope. Envelope peaks above an adaptive
+    threshold, the moving average of the envelope scaled by threshold_scale, and separated
+    by at least the refractory period given by bpmmax, are taken as beats. Each beat is then
+    located at the maximum of the input signal near the envelope peak. As in heartpy, beats
+    whose preceding RR interval deviates from the mean RR interval by more than 30%, or at
+    least 300 ms, are rejected.
+
+    Args:
+        signal (np.ndarray): ECG waveform.
+        sample_rate (float): Sampling rate of the waveform (Hz).
+        bpmmax (float, optional): Maximum theoretical heartrate. Defaults to 200.0.
+        band (tuple, optional): Pass band of the QRS filter (Hz). The upper edge is limited\
+            to 90% of the Nyquist frequency. Defaults to (5, 15).
+        envelope_width (float, optional): Width of the envelope moving average (s). Defaults to 0.1.
+        threshold_width (float, optional): Width of the threshold moving average (s). Defaults to 2.
+        threshold_scale (float, optional): Factor applied to the threshold moving average. Defaults to 1.5.
+        search_width (float, optional): Half-width of the window where each beat is located\
+            in the input signal (s). Defaults to 0.05.
+
+    Returns:
+        tuple: working_data and measures dictionaries, with the same peak and RR interval keys as heartpy.
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    high = min(band[1], 0.45 * sample_rate)
+    sos = butter(3, [band[0], high], btype="bandpass", fs=sample_rate, output="sos")
+    energy = sosfiltfilt(sos, signal) ** 2
+    envelope = uniform_filter1d(energy, size=max(1, int(round(envelope_width * sample_rate))))
+    threshold = threshold_scale * uniform_filter1d(
+        envelope, size=max(1, int(round(threshold_width * sample_rate)))
+    )
+    refractory = max(1, int(sample_rate * 60 / bpmmax))
+    candidates, _ = find_peaks(envelope, height=threshold, distance=refractory)
+
+    # locate each beat at the signal maximum around the envelope peak
+    half_width = int(round(search_width * sample_rate))
+    padded = np.pad(signal, half_width, mode="edge")
+    windows = sliding_window_view(padded, 2 * half_width + 1)[candidates]
+    peaklist = np.unique(candidates + np.argmax(windows, axis=1) - half_width)
+
+    binary_peaklist = _reject_rr_outliers(peaklist, sample_rate)
+    working_data = {
+        "peaklist": peaklist,
+        "ybeat": signal[peaklist],
+        "binary_peaklist": binary_peaklist,
+        "removed_beats": peaklist[binary_peaklist == 0],
+        "removed_beats_y": signal[peaklist[binary_peaklist == 0]],
+    }
+    working_data = _update_rr(working_data, sample_rate)
+    return working_data, _rr_measures(working_data["RR_list_cor"])
+
+
+def _detect_peaks(filtered: np.ndarray, sample_rate: float, bpmmax: float, detector: str) -> tuple:
+    if detector == "heartpy":
+        return hp.process(filtered, sample_rate=sample_rate, bpmmax=bpmmax)
+    elif detector == "numpy":
+        return find_rpeaks(filtered, sample_rate=sample_rate, bpmmax=bpmmax)
+    else:
+        raise ValueError("The specified R-peak detector is not supported.")
+
+
+def _reject_rr_outliers(peaklist: np.ndarray, sample_rate: float) -> np.ndarray:
+    """Marks with 0 the peaks whose preceding RR interval deviates from the mean RR
+    interval by more than 30%, or at least 300 ms, as heartpy's check_peaks."""
+    binary_peaklist = np.ones(len(peaklist), dtype=np.int64)
+    if len(peaklist) > 1:
+        rr_list = np.diff(peaklist) / sample_rate * 1000.0
+        mean_rr = np.mean(rr_list)
+        tolerance = max(0.3 * mean_rr, 300)
+        binary_peaklist[np.flatnonzero(np.abs(rr_list - mean_rr) >= tolerance) + 1] = 0
+    return binary_peaklist
+
+
+def _update_rr(working_data: dict, sample_rate: float) -> dict:
+    """Computes RR intervals between consecutive peaks, and masks the
+    intervals bounded by any rejected peak, as heartpy's update_rr."""
+    peaklist = np.asarray(working_data["peaklist"])
+    binary_peaklist = np.asarray(working_data["binary_peaklist"])
+    rr_list = np.diff(peaklist) / sample_rate * 1000.0
+    rr_mask = (binary_peaklist[:-1] + binary_peaklist[1:] != 2).astype(int)
+    working_data["RR_list"] = rr_list
+    working_data["RR_indices"] = np.column_stack([peaklist[:-1], peaklist[1:]])
+    working_data["RR_masklist"] = rr_mask
+    working_data["RR_list_cor"] = rr_list[rr_mask == 0]
+    working_data["sample_rate"] = sample_rate
+    return working_data
+
+
+def _rr_measures(rr_list_cor: np.ndarray) -> dict:
+    if len(rr_list_cor) == 0:
+        return {"bpm": np.nan, "ibi": np.nan, "sdnn": np.nan, "rmssd": np.nan}
+    return {
+        "bpm": 60000 / np.mean(rr_list_cor),
+        "ibi": np.mean(rr_list_cor),
+        "sdnn": np.std(rr_list_cor),
+        "rmssd": np.sqrt(np.mean(np.diff(rr_list_cor) ** 2)) if len(rr_list_cor) > 1 else np.nan,
+    }
+
+
+def _process_ecg_segment(
+    raw: np.ndarray, skip_slice: int, sample_rate: float, bpmmax: float, highpass_cutoff: float, detector: str
+) -> tuple:
+    segment = resample_poly(raw, 1, skip_slice) if skip_slice > 1 else raw
+    filtered = hp.filter_signal(
+        segment, cutoff=highpass_cutoff, sample_rate=sample_rate, filtertype="highpass"
+    )
+    try:
+        working_data, _ = _detect_peaks(filtered, sample_rate, bpmmax, detector)
+    except hp.exceptions.BadSignalWarning:
+        return filtered, np.empty(0, dtype=np.int64)
+    return filtered, np.asarray(working_data["peaklist"], dtype=np.int64)
+
+
+def _decimate(signal: pd.Series, skip_slice: int, decimation: str) -> pd.Series:
+    if decimation == "slice":
+        return signal[::skip_slice].astype(np.float64)
+    elif decimation == "polyphase":
+        values = signal.values.astype(np.float64)
+        if skip_slice > 1:
+            values = resample_poly(values, 1, skip_slice)
+        return pd.Series(values, index=signal.index[::skip_slice], name=signal.name)
+    else:
+        raise ValueError("The specified decimation method is not supported.")
@@ -0,0 +1,315 @@
+import numpy as np
+import pandas as pd
+import shapely
+import geopandas as gpd
+
+from typing import Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+EARTH_RADIUS = 6371008.8
+MISSING_CELL = np.iinfo(np.int64).min
+
+
+def project_local(longitude, latitude, latitude_origin: float = None) -> tuple[np.ndarray, np.ndarray]:
+    """Projects longitude / latitude coordinates to a local equirectangular
+    plane in meters, which is accurate over the extent of a single walk.
+
+    Args:
+        longitude (array_like): Longitude in degrees.
+        latitude (array_like): Latitude in degrees.
+        latitude_origin (float, optional): Latitude where the scale is true.\
+            If None, the mean latitude is used. Defaults to None.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Easting and northing in meters.
+    """
+    longitude = np.asarray(longitude, dtype=np.float64)
+    latitude = np.asarray(latitude, dtype=np.float64)
+    if latitude_origin is None:
+        latitude_origin = np.nanmean(latitude) if latitude.size > 0 else 0.0
+    x = EARTH_RADIUS * np.radians(longitude) * np.cos(np.radians(latitude_origin))
+    y = EARTH_RADIUS * np.radians(latitude)
+    return x, y
+
+
+def simplify_line(x, y, tolerance: float) -> np.ndarray:
+    """Simplifies a polyline with the Douglas-Peucker algorithm, such that no
+    removed vertex is further than tolerance from the simplified line.
+
+    Distances to each candidate segment are computed for all of its vertices
+    at once. Vertices with missing coordinates are dropped.
+
+    Args:
+        x (array_like): Projected x coordinates, in path order.
+        y (array_like): Projected y coordinates, in path order.
+        tolerance (float): Maximum distance between the original and simplified\
+            line, in the units of the coordinates.
+
+    Returns:
+        np.ndarray: Sorted indices of the vertices kept, including both ends of the line.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(valid) < 3:
+        return valid
+    x = x[valid]
+    y = y[valid]
+
+    keep = np.zeros(len(x), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(x) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        dx = x[end] - x[start]
+        dy = y[end] - y[start]
+        px = x[start + 1 : end] - x[start]
+        py = y[start + 1 : end] - y[start]
+        length = dx * dx + dy * dy
+        if length == 0:
+            distance = np.hypot(px, py)
+        else:
+            # distance to the segment, not the infinite line, so that loops are preserved
+            t = np.clip((px * dx + py * dy) / length, 0, 1)
+            distance = np.hypot(px - t * dx, py - t * dy)
+        farthest = np.argmax(distance)
+        if distance[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return valid[keep]
+
+
+def simplify_lonlat(longitude, latitude, tolerance: float) -> np.ndarray:
+    """Simplifies a longitude / latitude track with the Douglas-Peucker algorithm
+    on locally projected coordinates.
+
+    Args:
+        longitude (array_like): Longitude in degrees, in path order.
+        latitude (array_like): Latitude in degrees, in path order.
+        tolerance (float): Maximum distance between the original and simplified track, in meters.
+
+    Returns:
+        np.ndarray: Sorted indices of the track points kept.
+    """
+    x, y = project_local(longitude, latitude)
+    return simplify_line(x, y, tolerance)
+
+
+class SpatialGrid:
+    """Tiling of the plane into square or hexagonal cells of fixed size, on a local
+    projection in meters. Cells are identified by integer ids, which are the same
+    for every session aggregated with the same grid.
+
+    Args:
+        cell_size (float): Side length of the cells, in meters.
+        latitude_origin (float): Latitude where the projection scale is true. It must be\
+            the same for all sessions whose cells are compared or merged.
+        kind (str, optional): Either "square" or "hex" (pointy-top hexagons). Defaults to "hex".
+    """
+
+    def __init__(self, cell_size: float, latitude_origin: float, kind: str = "hex") -> None:
+        if kind not in ("square", "hex"):
+            raise ValueError(f"Unsupported cell kind {kind}. Must be 'square' or 'hex'.")
+        if not cell_size > 0:
+            raise ValueError("Cell size must be positive.")
+        self.cell_size = float(cell_size)
+        self.latitude_origin = float(latitude_origin)
+        self.kind = kind
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SpatialGrid) and (self.cell_size, self.latitude_origin, self.kind) == (
+            other.cell_size,
+            other.latitude_origin,
+            other.kind,
+        )
+
+    def cell_ids(self, longitude, latitude) -> np.ndarray:
+        """Assigns each location to the id of the cell containing it. Locations with
+        missing coordinates are assigned to MISSING_CELL."""
+        x, y = project_local(longitude, latitude, self.latitude_origin)
+        valid = np.isfinite(x) & np.isfinite(y)
+        x = np.where(valid, x, 0) / self.cell_size
+        y = np.where(valid, y, 0) / self.cell_size
+        if self.kind == "square":
+            i, j = np.floor(x), np.floor(y)
+        else:
+            i, j = _hex_round((np.sqrt(3) / 3) * x - y / 3, (2 / 3) * y)
+        ids = (i.astype(np.int64) << 32) | (j.astype(np.int64) & 0xFFFFFFFF)
+        return np.where(valid, ids, MISSING_CELL)
+
+    def cell_polygons(self, ids) -> np.ndarray:
+        """Builds the polygon of each cell, in longitude / latitude coordinates."""
+        ids = np.asarray(ids, dtype=np.int64)
+        i = (ids >> 32).astype(np.float64)
+        j = (ids & 0xFFFFFFFF).astype(np.uint32).astype(np.int32).astype(np.float64)
+        if self.kind == "square":
+            cx, cy = i + 0.5, j + 0.5
+            angles = np.radians([225, 315, 45, 135])
+            radius = np.sqrt(2) / 2
+        else:
+            cx, cy = np.sqrt(3) * i + (np.sqrt(3) / 2) * j, 1.5 * j
+            angles = np.radians(30 + 60 * np.arange(6))
+            radius = 1
+        x = (cx[:, None] + radius * np.cos(angles)) * self.cell_size
+        y = (cy[:, None] + radius * np.sin(angles)) * self.cell_size
+        longitude = np.degrees(x / (EARTH_RADIUS * np.cos(np.radians(self.latitude_origin))))
+        latitude = np.degrees(y / EARTH_RADIUS)
+        return shapely.polygons(np.stack([longitude, latitude], axis=-1))
+
+
+def _hex_round(q: np.ndarray, r: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # rounds fractional axial coordinates to the nearest hexagon, through cube coordinates
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq, rr
+
+
+class SpatialAggregate:
+    """Per-cell statistics of georeferenced samples, stored as partial aggregates
+    (count, sum, sum of squares, min and max of each column), such that aggregates of
+    different sessions can be computed independently and merged.
+
+    Args:
+        grid (SpatialGrid): Grid assigning samples to cells.
+        partials (pd.DataFrame): Partial aggregates indexed by cell id, with a column for\
+            each (column, statistic) pair.
+    """
+
+    _PARTIALS = ("count", "sum", "sumsq", "min", "max")
+
+    def __init__(self, grid: SpatialGrid, partials: pd.DataFrame) -> None:
+        self.grid = grid
+        self.partials = partials
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.partials.columns.get_level_values(0).unique())
+
+    @staticmethod
+    def from_frame(
+        data: pd.DataFrame, grid: SpatialGrid, columns: Optional[list[str]] = None
+    ) -> "SpatialAggregate":
+        """Aggregates the samples of a session.
+
+        Args:
+            data (pd.DataFrame): Samples, either a GeoDataFrame of points or a DataFrame with\
+                Longitude and Latitude columns, e.g. the output of convert_dataset_to_geoframe.
+            grid (SpatialGrid): Grid assigning samples to cells.
+            columns (Optional[list[str]], optional): Numeric columns to aggregate. If None,\
+                all numeric columns other than the coordinates are used. Defaults to None.
+        """
+        if isinstance(data, gpd.GeoDataFrame):
+            coords = data.get_coordinates()
+            longitude, latitude = coords.x.values, coords.y.values
+        else:
+            longitude, latitude = data["Longitude"].values, data["Latitude"].values
+        if columns is None:
+            exclude = {"Longitude", "Latitude", "Elevation"}
+            columns = [
+                column for column in data.select_dtypes(include="number").columns if column not in exclude
+            ]
+
+        ids = grid.cell_ids(longitude, latitude)
+        inside = ids != MISSING_CELL
+        values = data[columns].astype(np.float64).reset_index(drop=True)[inside]
+        grouped = values.groupby(ids[inside], sort=True)
+        partials = pd.concat(
+            {
+                "count": grouped.count(),
+                "sum": grouped.sum(),
+                "sumsq": (values**2).groupby(ids[inside], sort=True).sum(),
+                "min": grouped.min(),
+                "max": grouped.max(),
+            },
+            axis=1,
+        ).swaplevel(axis=1)
+        partials.index.name = "cell"
+        return SpatialAggregate(
+            grid, partials.reindex(columns=pd.MultiIndex.from_product([columns, SpatialAggregate._PARTIALS]))
+        )
+
+    def merge(self, *others: "SpatialAggregate") -> "SpatialAggregate":
+        """Combines aggregates computed with the same grid, e.g. from different sessions."""
+        if any(other.grid != self.grid for other in others):
+            raise ValueError("Only aggregates computed with the same grid can be merged.")
+        partials = pd.concat([self.partials] + [other.partials for other in others])
+        reduce = {
+            key: ("min" if key[1] == "min" else "max" if key[1] == "max" else "sum")
+            for key in partials.columns
+        }
+        merged = partials.groupby(level=0, sort=True).agg(reduce)
+        return SpatialAggregate(self.grid, merged)
+
+    def to_geoframe(
+        self, statistics: tuple[str, ...] = ("count", "mean", "std", "min", "max")
+    ) -> gpd.GeoDataFrame:
+        """Computes the statistics of each cell.
+
+        Args:
+            statistics (tuple[str, ...], optional): Statistics to compute for each column, among\
+                "count", "sum", "mean", "std", "min" and "max". Defaults to all but "sum".
+
+        Returns:
+            gpd.GeoDataFrame: One row per cell, with its polygon and a "<column>_<statistic>"\
+                column for each statistic.
+        """
+        result = {}
+        for column in self.columns:
+            partials = self.partials[column]
+            count = partials["count"].to_numpy()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = partials["sum"].to_numpy() / count
+                variance = (partials["sumsq"].to_numpy() - count * mean**2) / (count - 1)
+            computed = {
+                "count": count,
+                "sum": partials["sum"].to_numpy(),
+                "mean": mean,
+                "std": np.sqrt(np.clip(variance, 0, None)),
+                "min": partials["min"].to_numpy(),
+                "max": partials["max"].to_numpy(),
+            }
+            for statistic in statistics:
+                if statistic not in computed:
+                    raise ValueError(f"Unsupported statistic {statistic}.")
+                result[f"{column}_{statistic}"] = computed[statistic]
+        return gpd.GeoDataFrame(
+            result,
+            index=self.partials.index,
+            geometry=self.grid.cell_polygons(self.partials.index.values),
+            crs="EPSG:4326",
+        )
+
+
+def aggregate_sessions(
+    sessions: Iterable[pd.DataFrame],
+    grid: SpatialGrid,
+    columns: Optional[list[str]] = None,
+    max_workers: Optional[int] = None,
+) -> SpatialAggregate:
+    """Aggregates the samples of many sessions on a shared grid. Sessions are
+    aggregated concurrently, and their partial aggregates merged.
+
+    Args:
+        sessions (Iterable[pd.DataFrame]): Samples of each session, see SpatialAggregate.from_frame.
+        grid (SpatialGrid): Grid assigning samples to cells.
+        columns (Optional[list[str]], optional): Columns to aggregate. If None, the numeric\
+            columns of each session are used. Defaults to None.
+        max_workers (Optional[int], optional): Maximum number of sessions aggregated\
+            concurrently. If None, it will default to the ThreadPoolExecutor default.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        aggregates = list(
+            executor.map(lambda data: SpatialAggregate.from_frame(data, grid, columns), sessions)
+        )
+    if len(aggregates) == 0:
+        raise ValueError("No sessions to aggregate.")
+    return aggregates[0].merge(*aggregates[1:])
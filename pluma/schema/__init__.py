@@ -9,7 +9,7 @@ from typing import Union, Optional, Callable
 from pandas import DataFrame
 from sklearn.linear_model import LinearRegression
 
-from pluma.export.streams import shift_stream_index
+from pluma.export.streams import export_streams_table, shift_stream_index
 from pluma.schema.outdoor import build_schema
 
 from pluma.stream.unity import UnityGeoreferenceStream, UnityTransformStream
@@ -23,9 +23,16 @@ from pluma.sync import ClockRefId
 from pluma.stream import StreamType, Stream
 
 from pluma.export import maps
+from pluma.export.columnar import (
+    export_dataset_to_columnar,
+    read_columnar_manifest,
+    resolve_qualified_name,
+    restore_columnar_dataset,
+)
 from pluma.export.ogcapi.features import (
     convert_dataset_to_geoframe,
     export_dataset_to_geojson,
+    export_dataset_to_geoparquet,
 )
 
 from pluma.stream.ubx import UbxStream, _UBX_MSGIDS
@@ -205,6 +212,77 @@ class Dataset:
         with path.open("rb") as handle:
             self.streams = pickle.load(handle)
 
+    @staticmethod
+    def import_dataset_columnar(
+        path: Union[str, ComplexPath], streams: Optional[list] = None, memory_map: bool = True
+    ) -> Dataset:
+        """Imports a dataset exported with Dataset.export_dataset_columnar.
+
+        Args:
+            path (Union[str, ComplexPath]): Folder containing the exported dataset.
+            streams (list, optional): Keys of the streams to load, e.g. ['BioData.Set'].\
+                If None, all exported streams are loaded. Defaults to None.
+            memory_map (bool, optional): If True, local files are memory-mapped\
+                rather than read into memory. Defaults to True.
+        """
+        manifest = read_columnar_manifest(path)
+        dataset = Dataset(
+            manifest["rootfolder"],
+            datasetlabel=manifest["datasetlabel"],
+            georeference=Georeference(),
+            schema=resolve_qualified_name(manifest["schema"]),
+        )
+        restore_columnar_dataset(dataset, path, streams=streams, memory_map=memory_map)
+        return dataset
+
+    def export_dataset_columnar(
+        self, outdir: Union[str, ComplexPath, None] = None, max_workers: Optional[int] = None
+    ) -> None:
+        """Exports the dataset to a folder with one columnar file per stream
+        and a manifest with the schema, clock models and georeference.
+        Streams are written in parallel, and can be individually reloaded.
+
+        Args:
+            outdir (str, optional): Path to the output folder.\
+                If None, it will save to Dataset.root/dataset_columnar. Defaults to None.
+            max_workers (int, optional): Maximum number of streams written concurrently.\
+                Defaults to None.
+        """
+        if outdir is None:
+            outdir = ensure_complexpath(self.rootfolder)
+            outdir.join("dataset_columnar")
+        export_dataset_to_columnar(self, outdir, max_workers=max_workers)
+
+    def export_streams_table(
+        self,
+        outdir: Union[str, ComplexPath, None] = None,
+        sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1),
+        format: str = "parquet",
+        max_workers: Optional[int] = None,
+    ) -> dict:
+        """Resamples all streams against the same georeference and exports each one
+        to a Parquet or CSV table in a folder per device, with a manifest listing
+        the number of rows and time range of every exported stream.
+
+        Args:
+            outdir (str, optional): Path to the output folder.\
+                If None, it will save to Dataset.root/streams_table. Defaults to None.
+            sampling_dt (datetime.timedelta, optional): Sampling period of the exported\
+                tables. Defaults to datetime.timedelta(seconds=1).
+            format (str, optional): Either "parquet" or "csv". Defaults to "parquet".
+            max_workers (int, optional): Maximum number of streams exported concurrently.\
+                Defaults to None.
+
+        Returns:
+            dict: The manifest written to the output folder.
+        """
+        if outdir is None:
+            outdir = ensure_complexpath(self.rootfolder)
+            outdir.join("streams_table")
+        return export_streams_table(
+            self, ensure_complexpath(outdir).path, sampling_dt, format=format, max_workers=max_workers
+        )
+
     def populate_streams(self, root: Union[str, ComplexPath, None] = None, autoload: bool = False):
         """Populates the streams property with all the schema information.
 
@@ -285,5 +363,18 @@ class Dataset:
     def to_geoframe(self, sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1)):
         return convert_dataset_to_geoframe(self, sampling_dt)
 
-    def to_geojson(self, filename, sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1)):
-        export_dataset_to_geojson(self, filename, sampling_dt)
+    def to_geojson(
+        self,
+        filename,
+        sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1),
+        ndjson: bool = False,
+    ):
+        export_dataset_to_geojson(self, filename, sampling_dt, ndjson=ndjson)
+
+    def to_geoparquet(
+        self,
+        filename,
+        sampling_dt: datetime.timedelta = datetime.timedelta(seconds=1),
+        partition_freq: Optional[str] = None,
+    ):
+        export_dataset_to_geoparquet(self, filename, sampling_dt, partition_freq=partition_freq)
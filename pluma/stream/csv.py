@@ -35,9 +35,6 @@ class CsvStream(Stream):
         except FileExistsError:
             warnings.warn(f"Glia stream file {path} could not be found.")
 
-    def resample(self):
-        pass
-
     def convert_to_si(self, data=None):
         pass
 
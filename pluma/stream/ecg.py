@@ -1,7 +1,10 @@
+import copy
 import datetime
+import numpy as np
 import pandas as pd
 
 from dotmap import DotMap
+from typing import Optional
 
 from pluma.export.streams import resample_stream_ecg, shift_stream_index
 from pluma.io.harp import load_harp_stream
@@ -10,9 +13,98 @@ from pluma.stream.harp import HarpStream
 from pluma.stream.siconversion import SiUnitConversion
 from pluma.sync import ClockRefId
 
+_DERIVED_KEYS = ("Filtered", "Processed", "HeartRate")
+
+
+class _Pending:
+    def __repr__(self):
+        return "<not computed>"
+
+
+_PENDING = _Pending()
+
+
+class EcgData(DotMap):
+    """DotMap with the raw ECG signal, where the derived Filtered, Processed
+    and HeartRate entries are computed by the parent stream only when accessed."""
+
+    def __init__(self, stream: "EcgStream", raw: Optional[pd.DataFrame]):
+        super().__init__({"Raw": raw, **{key: _PENDING for key in _DERIVED_KEYS}}, _dynamic=False)
+        object.__setattr__(self, "_stream", stream)
+
+    def __getitem__(self, k):
+        value = super().__getitem__(k)
+        if value is _PENDING:
+            value = self._stream._derived_data()[k]
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def items(self):
+        return ((key, self[key]) for key in self.keys())
+
+    def iteritems(self):
+        return self.items()
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def copy(self):
+        return DotMap(dict(self.items()))
+
+    def __reduce__(self):
+        # the parent stream is restored with the state, after this object is created,
+        # so that references from the stream back to its data can be resolved
+        return (_new_ecg_data, (), self.__getstate__())
+
+    def __getstate__(self):
+        # derived entries not yet computed are restored as pending
+        entries = {key: value for key, value in self._map.items() if value is not _PENDING}
+        return {"stream": self._stream, "entries": entries}
+
+    def __setstate__(self, state):
+        EcgData.__init__(self, state["stream"], None)
+        for key, value in state["entries"].items():
+            self._map[key] = value
+
+    def __deepcopy__(self, memo=None):
+        memo = {} if memo is None else memo
+        result = _new_ecg_data()
+        memo[id(self)] = result
+        result.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        return result
+
+
+def _new_ecg_data() -> EcgData:
+    return EcgData.__new__(EcgData)
+
 
 class EcgStream(HarpStream):
-    def __init__(self, eventcode: int, clockreferenceid: ClockRefId = ClockRefId.HARP, **kw):
+    """ECG stream, where only the raw signal is read when loading. The filtered
+    signal and heart rate are computed on first access and memoized until any of
+    the heart rate parameters change.
+
+    Args:
+        eventcode (int): Harp event code of the ECG stream.
+        heartrate_params (dict, optional): Keyword arguments passed to heartrate_from_ecg.\
+            Defaults to None.
+        keep_working_data (bool, optional): If False, signal-sized arrays are dropped from\
+            the heartpy working_data stored in Processed. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        eventcode: int,
+        clockreferenceid: ClockRefId = ClockRefId.HARP,
+        heartrate_params: Optional[dict] = None,
+        keep_working_data: bool = True,
+        **kw,
+    ):
+        self.heartrate_params = {} if heartrate_params is None else dict(heartrate_params)
+        self.keep_working_data = keep_working_data
+        self._derived = None
+        self._derived_key = None
         super().__init__(
             eventcode,
             data=pd.DataFrame(columns=["Timestamp", "Value"]),
@@ -23,17 +115,44 @@ class EcgStream(HarpStream):
 
     def load(self):
         ecg = load_harp_stream(self.eventcode, root=self.rootfolder)
-        heartrate, filtered, working_data, measures = heartrate_from_ecg(ecg)
-        self.data = DotMap(
-            {
-                "Raw": ecg,
-                "Filtered": filtered,
-                "Processed": (working_data, measures),
-                "HeartRate": heartrate,
-            }
-        )
+        self.data = EcgData(self, ecg)
+        self.invalidate()
         self.si_conversion.is_si = False
 
+    def set_heartrate_params(self, **kwargs):
+        """Updates the heart rate parameters. Derived data is recomputed on next access."""
+        self.heartrate_params.update(kwargs)
+
+    def invalidate(self):
+        """Discards the memoized derived data."""
+        self._derived = None
+        self._derived_key = None
+
+    def _derived_data(self) -> dict:
+        key = (tuple(sorted(self.heartrate_params.items())), self.keep_working_data)
+        if self._derived is None or self._derived_key != key:
+            self._derived = self._compute_derived_data()
+            self._derived_key = key
+        return self._derived
+
+    def _compute_derived_data(self) -> dict:
+        ecg = self.data["Raw"]
+        if ecg is None:
+            return {key: None for key in _DERIVED_KEYS}
+
+        heartrate, filtered, working_data, measures = heartrate_from_ecg(ecg, **self.heartrate_params)
+        if not self.keep_working_data:
+            working_data = {
+                key: value
+                for key, value in working_data.items()
+                if not (isinstance(value, (np.ndarray, list)) and len(value) == len(filtered))
+            }
+        return {
+            "Filtered": filtered,
+            "Processed": (working_data, measures),
+            "HeartRate": heartrate,
+        }
+
     def __str__(self):
         return f"ECG stream from device {self.device}, stream {self.streamlabel}"
 
@@ -41,6 +160,11 @@ class EcgStream(HarpStream):
         return resample_stream_ecg(self, sampling_dt)
 
     def add_clock_offset(self, offset):
-        for stream in self.data.values():
+        if isinstance(self.data, EcgData):
+            # derived data not yet computed will inherit the offset from the raw signal
+            streams = [self.data["Raw"]] + ([] if self._derived is None else list(self._derived.values()))
+        else:
+            streams = self.data.values()
+        for stream in streams:
             if isinstance(stream, pd.DataFrame):
                 shift_stream_index(stream, offset)
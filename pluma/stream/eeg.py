@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import datetime
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple, Union
 
 from pluma.stream import Stream, StreamType
-from pluma.io.harp import to_datetime
+from pluma.io.harp import to_datetime, to_harptime
 from pluma.io.eeg import load_eeg, synchronize_eeg_to_harp
 from pluma.sync import ClockRefId
 
@@ -24,18 +26,22 @@ class EegStream(Stream):
         server_lsl_marker: Optional[pd.DataFrame] = None,
         clockreferenceid: ClockRefId = ClockRefId.HARP,
         autoalign: bool = True,
+        preload: bool = False,
         **kw,
     ):
         super(EegStream, self).__init__(data=data, **kw)
         self.streamtype = StreamType.EEG
         self.clockreference.referenceid = clockreferenceid
         self.autoalign = autoalign
+        self.preload = preload
         self.server_lsl_marker = server_lsl_marker
+        self.eeg_to_harp_model = None
+        self.clock_offset = None
         if self.autoload:
             self.load()
 
     def load(self):
-        self.data, _lsl_timestamp = load_eeg(filename=None, root=self.rootfolder)
+        self.data, _lsl_timestamp = load_eeg(filename=None, root=self.rootfolder, preload=self.preload)
         if self.server_lsl_marker is None:
             self.server_lsl_marker = _lsl_timestamp
         if self.data is not None and self.autoalign and (self.clockreference.referenceid == ClockRefId.HARP):
@@ -43,17 +49,140 @@ class EegStream(Stream):
 
     def align_to_harp(self):
         print("Attempting to automatically correct eeg timestamps to harp timestamps...")
-        eeg_to_harp_model = synchronize_eeg_to_harp(self.server_lsl_marker)
-        self.data.np_time = to_datetime(eeg_to_harp_model.predict(self.data.np_time.reshape(-1, 1)).flatten())
+        self.eeg_to_harp_model = synchronize_eeg_to_harp(self.server_lsl_marker)
+        self.data.np_time = to_datetime(
+            self.eeg_to_harp_model.predict(np.asarray(self.data.np_time).reshape(-1, 1)).flatten()
+        )
         print("Done.")
 
     def add_clock_offset(self, offset):
         if self.server_lsl_marker is not None:
             self.server_lsl_marker["Timestamp"] += offset
+        self.clock_offset = offset if self.clock_offset is None else self.clock_offset + offset
         self.data.np_time += offset
 
     def to_frame(self):
-        return pd.DataFrame(data=self.data.np_eeg, index=self.data.np_time)
+        return pd.DataFrame(data=np.asarray(self.data.np_eeg), index=self.data.np_time)
+
+    def sample_times(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Computes the timestamps of a range of EEG samples.
+
+        If the stream was aligned to harp, timestamps are computed on the fly
+        from the EEG sample clock with the harp synchronization model and the
+        accumulated clock offset. Otherwise, they are read from np_time.
+
+        Args:
+            start (int, optional): Index of the first sample. Defaults to 0.
+            stop (Optional[int], optional): Index after the last sample. If None,\
+                defaults to the end of the recording.
+
+        Returns:
+            np.ndarray: Timestamps of the samples in the [start, stop) range.
+        """
+        stop = self.data.n_times if stop is None else min(stop, self.data.n_times)
+        if self.eeg_to_harp_model is None:
+            return self.data.np_time[start:stop]
+
+        eeg_time = np.arange(start, stop) / self.data.info["sfreq"]
+        coef, intercept = self._harp_model_params()
+        times = to_datetime(eeg_time * coef + intercept).values
+        if self.clock_offset is not None:
+            times = times + np.asarray(self.clock_offset, dtype="timedelta64[ns]")
+        return times
+
+    def sample_range(self, start=None, end=None) -> Tuple[int, int]:
+        """Returns the [start, stop) range of sample indices with
+        timestamps between start and end, inclusive."""
+        n_times = self.data.n_times
+        if self.eeg_to_harp_model is None:
+            times = pd.Index(self.data.np_time)
+            first = 0 if start is None else int(times.searchsorted(start, side="left"))
+            stop = n_times if end is None else int(times.searchsorted(end, side="right"))
+            return first, max(first, stop)
+
+        # invert the linear model to find approximate bounds, then
+        # refine them against the exact sample timestamps
+        first, stop = 0, n_times
+        if start is not None:
+            first = int(np.clip(np.floor(self._to_sample(start)) - 1, 0, n_times))
+            first += int(pd.Index(self.sample_times(first, first + 3)).searchsorted(start, side="left"))
+        if end is not None:
+            last = int(np.clip(np.floor(self._to_sample(end)) - 1, 0, n_times))
+            stop = last + int(pd.Index(self.sample_times(last, last + 3)).searchsorted(end, side="right"))
+        return first, max(first, stop)
+
+    def get_window(
+        self, start=None, end=None, picks: Optional[Union[List[str], List[int]]] = None
+    ) -> pd.DataFrame:
+        """Reads the EEG samples with timestamps between start and end, inclusive.
+
+        Only the requested samples and channels are read from the file.
+
+        Args:
+            start (optional): Start of the window. If None, the window starts at the first sample.
+            end (optional): End of the window. If None, the window ends at the last sample.
+            picks (Optional[Union[List[str], List[int]]], optional): Channel names, or column\
+                indices of np_eeg, to read. If None, all EEG channels are read. Defaults to None.
+
+        Returns:
+            pd.DataFrame: EEG samples, in np_eeg units, indexed by timestamp.
+        """
+        return self._read_samples(*self.sample_range(start, end), picks=picks)
+
+    def iter_chunks(
+        self,
+        chunk_duration: Union[datetime.timedelta, float],
+        start=None,
+        end=None,
+        picks: Optional[Union[List[str], List[int]]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Iterates over consecutive, non-overlapping chunks of EEG samples,
+        reading one chunk at a time from the file.
+
+        Args:
+            chunk_duration (Union[datetime.timedelta, float]): Duration of each chunk, or\
+                number of seconds if a float is given.
+            start (optional): Start of the first chunk. If None, iteration starts at the first sample.
+            end (optional): End of the last chunk. If None, iteration stops at the last sample.
+            picks (Optional[Union[List[str], List[int]]], optional): Channel names, or column\
+                indices of np_eeg, to read. If None, all EEG channels are read. Defaults to None.
+
+        Yields:
+            pd.DataFrame: EEG samples of each chunk, in np_eeg units, indexed by timestamp.
+        """
+        if isinstance(chunk_duration, datetime.timedelta):
+            chunk_duration = chunk_duration.total_seconds()
+        chunk_size = int(round(chunk_duration * self.data.info["sfreq"]))
+        if chunk_size <= 0:
+            raise ValueError("chunk_duration must be longer than one sample.")
+
+        first, stop = self.sample_range(start, end)
+        for chunk_start in range(first, stop, chunk_size):
+            yield self._read_samples(chunk_start, min(chunk_start + chunk_size, stop), picks=picks)
+
+    def _read_samples(self, start: int, stop: int, picks=None) -> pd.DataFrame:
+        np_eeg = self.data.np_eeg
+        columns = np.arange(np_eeg.shape[1])
+        if picks is not None:
+            names = [self.data.ch_names[i] for i in np_eeg.picks]
+            columns = np.array([names.index(pick) if isinstance(pick, str) else pick for pick in picks])
+        return pd.DataFrame(
+            data=np_eeg[start:stop, columns],
+            index=self.sample_times(start, stop),
+            columns=[self.data.ch_names[i] for i in np_eeg.picks[columns]],
+        )
+
+    def _harp_model_params(self) -> Tuple[float, float]:
+        coef = float(np.ravel(self.eeg_to_harp_model.coef_)[0])
+        intercept = float(np.ravel(self.eeg_to_harp_model.intercept_)[0])
+        return coef, intercept
+
+    def _to_sample(self, time) -> float:
+        time = pd.Timestamp(time)
+        if self.clock_offset is not None:
+            time = time - self.clock_offset
+        coef, intercept = self._harp_model_params()
+        return (to_harptime(time.to_datetime64()) - intercept) / coef * self.data.info["sfreq"]
 
     def __str__(self):
         return f"EEG stream from device {self.device}, stream {self.streamlabel}"
@@ -1,9 +1,14 @@
+import numpy as np
 import pandas as pd
 import geopandas
+import shapely
 
 import warnings
+from typing import Optional
+from scipy.spatial import cKDTree
 from shapely.errors import ShapelyDeprecationWarning
 from pluma.export.maps import export_kml_line
+from pluma.preprocessing.spatial import project_local
 from pluma.sync import ClockReference, ClockRefId
 
 warnings.filterwarnings("ignore", category=ShapelyDeprecationWarning)
@@ -32,6 +37,23 @@ class Georeference:
         else:
             self._refresh_properties()
         self.clockreference = ClockReference(referenceid=clockreferenceid)
+        self._index = None
+
+    @property
+    def spatial_index(self) -> "GeoreferenceIndex":
+        """Spatio-temporal index over the georeference points. It is built on first
+        access and rebuilt whenever the spacetime data or its time index are replaced."""
+        spacetime = self._spacetime
+        index = getattr(self, "_index", None)
+        if index is None or index.spacetime is not spacetime or index.source_index is not spacetime.index:
+            self._index = index = GeoreferenceIndex(spacetime)
+        return index
+
+    def __getstate__(self):
+        # the spatial index is rebuilt on demand, rather than serialized
+        state = self.__dict__.copy()
+        state["_index"] = None
+        return state
 
     @property
     def spacetime(self):
@@ -163,5 +185,109 @@ class Georeference:
     def __repr__(self) -> str:
         return repr(self.spacetime)
 
-    def export_kml(self, export_path: str = "walk.kml", **kwargs):
-        export_kml_line(df=self.spacetime, export_path=export_path, **kwargs)
+    def export_kml(
+        self,
+        export_path: str = "walk.kml",
+        tolerance: Optional[float] = None,
+        time_segments: bool = False,
+        **kwargs,
+    ):
+        export_kml_line(
+            df=self.spacetime,
+            output_path=export_path,
+            tolerance=tolerance,
+            time_segments=time_segments,
+            **kwargs,
+        )
+
+
+class GeoreferenceIndex:
+    """Spatio-temporal index over the points of a georeference, answering region and
+    proximity queries with time intervals that can be used to slice streams.
+
+    Points are projected to a local plane in meters and stored in an STR-tree for
+    region queries, and in a KD-tree, built on first use, for nearest neighbour queries.
+
+    Args:
+        spacetime (pd.DataFrame): Georeference with Longitude and Latitude columns, indexed by time.
+    """
+
+    def __init__(self, spacetime: pd.DataFrame) -> None:
+        self.spacetime = spacetime
+        self.source_index = spacetime.index
+        times = spacetime.index.values.astype("datetime64[ns]")
+        order = np.argsort(times, kind="stable")
+        self.times = times[order]
+
+        longitude = spacetime["Longitude"].to_numpy(dtype=np.float64)[order]
+        latitude = spacetime["Latitude"].to_numpy(dtype=np.float64)[order]
+        valid = np.isfinite(longitude) & np.isfinite(latitude)
+        self.latitude_origin = float(np.mean(latitude[valid])) if np.any(valid) else 0.0
+        self._positions = order
+        self._valid = np.flatnonzero(valid)
+        x, y = project_local(longitude[valid], latitude[valid], self.latitude_origin)
+        self._xy = np.column_stack([x, y])
+        self._tree = shapely.STRtree(shapely.points(self._xy))
+        self._kdtree = None
+
+    def project(self, geometry):
+        """Projects a geometry from longitude / latitude to the local plane of the index."""
+        return shapely.transform(
+            geometry, lambda coords: np.column_stack(project_local(*coords.T, self.latitude_origin))
+        )
+
+    def intervals_within(
+        self, geometry, max_gap: Optional[pd.Timedelta] = None, buffer: float = 0
+    ) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """Finds the time intervals during which the georeference was inside a region.
+
+        Args:
+            geometry (shapely.Geometry): Region in longitude / latitude coordinates.
+            max_gap (Optional[pd.Timedelta], optional): Consecutive visits separated by less\
+                than this time are merged into a single interval. Defaults to None.
+            buffer (float, optional): Distance in meters by which the region is grown. Defaults to 0.
+
+        Returns:
+            list[tuple[pd.Timestamp, pd.Timestamp]]: Start and end time of each visit, in time\
+                order, e.g. to be passed to Stream.slice(start, end).
+        """
+        region = self.project(geometry)
+        if buffer > 0:
+            region = shapely.buffer(region, buffer)
+        hits = self._valid[np.sort(self._tree.query(region, predicate="intersects"))]
+        if len(hits) == 0:
+            return []
+
+        # a visit ends when a sample in between is outside the region
+        breaks = np.flatnonzero(np.diff(hits) > 1)
+        starts = self.times[hits[np.r_[0, breaks + 1]]]
+        ends = self.times[hits[np.r_[breaks, len(hits) - 1]]]
+        if max_gap is not None:
+            keep = np.r_[True, (starts[1:] - ends[:-1]) >= np.timedelta64(pd.Timedelta(max_gap))]
+            starts = starts[keep]
+            ends = ends[np.r_[np.flatnonzero(keep)[1:] - 1, len(ends) - 1]]
+        return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in zip(starts, ends)]
+
+    def nearest(self, longitude: float, latitude: float, k: int = 1) -> pd.DataFrame:
+        """Finds the georeference samples closest to a location.
+
+        Args:
+            longitude (float): Longitude in degrees.
+            latitude (float): Latitude in degrees.
+            k (int, optional): Number of samples to return. Defaults to 1.
+
+        Returns:
+            pd.DataFrame: The k closest georeference samples, sorted by distance,\
+                with an additional Distance column in meters.
+        """
+        if self._kdtree is None:
+            self._kdtree = cKDTree(self._xy)
+        k = min(k, len(self._xy))
+        if k == 0:
+            return self.spacetime.iloc[[]].assign(Distance=[])
+        x, y = project_local(longitude, latitude, self.latitude_origin)
+        distance, hits = self._kdtree.query([float(x), float(y)], k=k)
+        distance, hits = np.atleast_1d(distance), np.atleast_1d(hits)
+        result = self.spacetime.iloc[self._positions[self._valid[hits]]].copy()
+        result["Distance"] = distance
+        return result
@@ -1,13 +1,28 @@
+import warnings
+import datetime
 import numpy as np
+import pandas as pd
+import geopandas as gpd
+
+from typing import Optional, Tuple, Union
 
 from pluma.stream import Stream, StreamType
 from pluma.stream.siconversion import SiUnitConversion
+from pluma.io.harp import load_harp_stream, to_datetime, to_harptime
 from pluma.io.microphone import load_microphone
 from pluma.sync import ClockRefId
+from pluma.preprocessing.audio import compute_acoustic_features
+from pluma.export.streams import resample_stream_microphone
 
 
 class MicrophoneStream(Stream):
-    """_summary_
+    """Microphone waveform stream, memory-mapped from the raw audio file.
+
+    Sample timestamps are computed on demand by interpolating the position
+    of each audio buffer against the harp timestamp of its BufferIndex event.
+    Each BufferIndex event is assumed to be logged when the buffer with that
+    index has been completely written to the audio file, and the first event
+    is assumed to correspond to the first buffer in the file.
 
     Args:
             Stream (_type_): _description_
@@ -18,14 +33,20 @@ class MicrophoneStream(Stream):
         data: np.array = np.empty(shape=(0, 2)),
         fs: float = None,
         channels: int = 2,
+        buffer_size: Optional[int] = None,
+        buffer_eventcode: int = 222,
         si_conversion: SiUnitConversion = SiUnitConversion(),
-        clockreferenceid: ClockRefId = ClockRefId.NONE,
+        clockreferenceid: ClockRefId = ClockRefId.HARP,
         **kw,
     ):
         super(MicrophoneStream, self).__init__(data=data, **kw)
         self.streamtype = StreamType.MICROPHONE
         self.fs = fs
         self.channels = channels
+        self.buffer_size = buffer_size
+        self.buffer_eventcode = buffer_eventcode
+        self.buffer_index = None
+        self.clock_offset = None
         self.si_conversion = si_conversion
         self.clockreference.referenceid = clockreferenceid
 
@@ -34,7 +55,131 @@ class MicrophoneStream(Stream):
 
     def load(self):
         self.data = load_microphone(root=self.rootfolder, channels=self.channels)
+        self.buffer_index = None
+        self.clock_offset = None
+        if self.data is not None and self.clockreference.referenceid == ClockRefId.HARP:
+            buffer_index = load_harp_stream(self.buffer_eventcode, root=self.rootfolder)
+            if buffer_index is None or len(buffer_index) == 0:
+                warnings.warn(f"Microphone buffer index stream {self.buffer_eventcode} is empty.")
+            else:
+                self.buffer_index = buffer_index
 
     def __str__(self):
         return f"Microphone stream from device {self.device},\
       stream {self.streamlabel}"
+
+    def add_clock_offset(self, offset):
+        self.clock_offset = offset if self.clock_offset is None else self.clock_offset + offset
+
+    def buffer_positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the audio sample position at the end of each buffer,
+        and the corresponding harp timestamps in seconds."""
+        if self.buffer_index is None:
+            raise ValueError("Microphone stream has no buffer index to compute sample timestamps.")
+        index = self.buffer_index.iloc[:, 0].values.astype(np.int64)
+        buffer_size = self.buffer_size
+        if buffer_size is None:
+            buffer_size = int(round(len(self.data) / (index[-1] - index[0] + 1)))
+        positions = (index - index[0] + 1) * buffer_size
+        return positions.astype(np.float64), to_harptime(self.buffer_index.index.values)
+
+    def sample_times(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Computes the timestamps of a range of audio samples.
+
+        Args:
+            start (int, optional): Index of the first sample. Defaults to 0.
+            stop (Optional[int], optional): Index after the last sample. If None,\
+                defaults to the end of the recording.
+
+        Returns:
+            np.ndarray: Timestamps of the samples in the [start, stop) range.
+        """
+        stop = len(self.data) if stop is None else min(stop, len(self.data))
+        return self.sample_times_at(np.arange(start, stop))
+
+    def sample_times_at(self, samples: np.ndarray) -> np.ndarray:
+        """Computes the timestamps of the specified (possibly fractional) audio sample indices."""
+        positions, seconds = self.buffer_positions()
+        times = to_datetime(_interp(np.asarray(samples, dtype=np.float64), positions, seconds)).values
+        if self.clock_offset is not None:
+            times = times + np.asarray(self.clock_offset, dtype="timedelta64[ns]")
+        return times
+
+    def sample_range(self, start=None, end=None) -> Tuple[int, int]:
+        """Returns the [start, stop) range of sample indices with
+        timestamps between start and end, inclusive."""
+        n_samples = len(self.data)
+        first, stop = 0, n_samples
+        if start is not None:
+            first = int(np.clip(np.floor(self._to_sample(start)) - 1, 0, n_samples))
+            first += int(pd.Index(self.sample_times(first, first + 3)).searchsorted(start, side="left"))
+        if end is not None:
+            last = int(np.clip(np.floor(self._to_sample(end)) - 1, 0, n_samples))
+            stop = last + int(pd.Index(self.sample_times(last, last + 3)).searchsorted(end, side="right"))
+        return first, max(first, stop)
+
+    def slice(self, start=None, end=None) -> np.ndarray:
+        """Returns the audio samples with timestamps between start and end, inclusive.
+        For memory-mapped data, the returned array is a view of the file."""
+        first, stop = self.sample_range(start, end)
+        return self.data[first:stop]
+
+    def sampling_rate(self) -> float:
+        """Returns the nominal sampling rate, if set, or otherwise
+        the sampling rate estimated from the buffer timestamps."""
+        if self.fs is not None:
+            return self.fs
+        positions, seconds = self.buffer_positions()
+        return (positions[-1] - positions[0]) / (seconds[-1] - seconds[0])
+
+    def acoustic_features(
+        self,
+        window: Union[datetime.timedelta, float] = 1.0,
+        hop: Union[datetime.timedelta, float] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Computes per-window acoustic levels over the whole recording, one chunk
+        of windows at a time. See pluma.preprocessing.audio.compute_acoustic_features.
+
+        Args:
+            window (Union[datetime.timedelta, float], optional): Duration of each analysis window,\
+                or number of seconds if a float is given. Defaults to 1 second.
+            hop (Union[datetime.timedelta, float], optional): Time between the start of consecutive\
+                windows. If None, defaults to the window duration.
+
+        Returns:
+            pd.DataFrame: Levels for each window, indexed by the timestamp of the center of the window.
+        """
+        fs = self.sampling_rate()
+        window_size = int(round(_to_seconds(window) * fs))
+        hop_size = None if hop is None else int(round(_to_seconds(hop) * fs))
+        features = compute_acoustic_features(self.data, fs, window_size, hop_size, **kwargs)
+        features.index = pd.DatetimeIndex(self.sample_times_at(features.index.values), name="Timestamp")
+        return features
+
+    def resample(self, sampling_dt: datetime.timedelta, **kwargs) -> gpd.GeoDataFrame:
+        return resample_stream_microphone(self, sampling_dt, **kwargs)
+
+    def _to_sample(self, time) -> float:
+        time = pd.Timestamp(time)
+        if self.clock_offset is not None:
+            time = time - self.clock_offset
+        positions, seconds = self.buffer_positions()
+        return float(_interp(to_harptime(time.to_datetime64()), seconds, positions))
+
+
+def _to_seconds(value: Union[datetime.timedelta, float]) -> float:
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    return value
+
+
+def _interp(x, xp: np.ndarray, fp: np.ndarray):
+    """Piecewise linear interpolation, with linear extrapolation outside
+    the data points using the average slope over all data points."""
+    y = np.interp(x, xp, fp)
+    if len(xp) > 1:
+        slope = (fp[-1] - fp[0]) / (xp[-1] - xp[0])
+        y = np.where(x < xp[0], fp[0] + (x - xp[0]) * slope, y)
+        y = np.where(x > xp[-1], fp[-1] + (x - xp[-1]) * slope, y)
+    return y
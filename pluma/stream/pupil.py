@@ -1,7 +1,23 @@
+import warnings
 import numpy as np
+import pandas as pd
+
+from enum import IntEnum
+from typing import Iterator, Optional, Tuple
 
 from pluma.stream import StreamType
 from pluma.stream.zeromq import ZmqStream
+from pluma.io.zeromq import load_zeromq_payload
+
+
+class PupilFrameFormat(IntEnum):
+    """Encoding of the world camera frame payloads, following the
+    order of the frame formats published by the Pupil Labs network API."""
+
+    JPEG = 0
+    YUV = 1
+    BGR = 2
+    GRAY = 3
 
 
 class PupilGazeStream(ZmqStream):
@@ -52,3 +68,97 @@ class PupilWorldCameraStream(ZmqStream):
             ],
             **kw,
         )
+
+    def load(self):
+        super(PupilWorldCameraStream, self).load()
+        self._payload = None
+        self._frame_offsets = None
+
+    @property
+    def payload(self) -> Optional[np.ndarray]:
+        """Memory-mapped byte buffer with the concatenated frame payloads."""
+        if getattr(self, "_payload", None) is None:
+            self._payload = load_zeromq_payload(self.filenames[2], root=self.rootfolder)
+        return self._payload
+
+    @property
+    def frame_offsets(self) -> np.ndarray:
+        """Byte offset of each frame payload, with the end of the last payload appended."""
+        if getattr(self, "_frame_offsets", None) is None:
+            if self.data is None or "DataBytes" not in self.data:
+                raise ValueError("World camera stream has no frame metadata to index the payloads.")
+            data_bytes = self.data["DataBytes"].fillna(0).values.astype(np.int64)
+            offsets = np.zeros(len(data_bytes) + 1, dtype=np.int64)
+            np.cumsum(data_bytes, out=offsets[1:])
+            payload = self.payload
+            if payload is not None and offsets[-1] != len(payload):
+                warnings.warn(
+                    f"Size of the frame payload file ({len(payload)} bytes) does not match"
+                    f" the size of the indexed frames ({offsets[-1]} bytes)."
+                )
+            self._frame_offsets = offsets
+        return self._frame_offsets
+
+    @property
+    def frame_count(self) -> int:
+        return 0 if self.data is None else len(self.data)
+
+    def get_frame(self, i: int, decode: bool = True) -> np.ndarray:
+        """Reads a single world camera frame from the memory-mapped payload file.
+
+        Args:
+            i (int): Position of the frame in the stream. Negative positions count from the end.
+            decode (bool, optional): If True, raw BGR and GRAY frames are returned as\
+                (Height, Width, 3) and (Height, Width) arrays, respectively. Compressed and\
+                YUV frames are always returned as the encoded bytes. Defaults to True.
+
+        Returns:
+            np.ndarray: Read-only view of the frame in the payload file.
+        """
+        n_frames = self.frame_count
+        if i < -n_frames or i >= n_frames:
+            raise IndexError(f"Frame {i} is out of range for a stream with {n_frames} frames.")
+        i = i % n_frames
+        payload = self.payload
+        if payload is None:
+            raise ValueError("World camera frame payload file could not be found.")
+        offsets = self.frame_offsets
+        if offsets[i + 1] > len(payload):
+            raise ValueError(f"Frame {i} is past the end of the frame payload file.")
+        buffer = payload[offsets[i] : offsets[i + 1]]
+        if not decode:
+            return buffer
+        header = self.data[["Format", "Width", "Height"]].iloc[i].values.astype(np.float64)
+        if np.any(np.isnan(header)):
+            raise ValueError(f"Frame {i} has missing Format, Width or Height metadata.")
+        return _decode_frame(buffer, *header.astype(np.int64))
+
+    def iter_frames(
+        self, start=None, end=None, decode: bool = True
+    ) -> Iterator[Tuple[pd.Timestamp, np.ndarray]]:
+        """Iterates over the world camera frames with timestamps between start and end, inclusive,
+        reading one frame at a time from the payload file.
+
+        Args:
+            start (optional): Start of the iteration. If None, iteration starts at the first frame.
+            end (optional): End of the iteration. If None, iteration stops at the last frame.
+            decode (bool, optional): Whether to decode raw frames. See get_frame. Defaults to True.
+
+        Yields:
+            Tuple[pd.Timestamp, np.ndarray]: Harp timestamp and contents of each frame.
+        """
+        if self.data is None:
+            return
+        index = self.data.index
+        first = 0 if start is None else int(index.searchsorted(start, side="left"))
+        stop = len(index) if end is None else int(index.searchsorted(end, side="right"))
+        for i in range(first, stop):
+            yield index[i], self.get_frame(i, decode=decode)
+
+
+def _decode_frame(buffer: np.ndarray, format: int, width: int, height: int) -> np.ndarray:
+    if format == PupilFrameFormat.BGR and len(buffer) == width * height * 3:
+        return buffer.reshape(height, width, 3)
+    if format == PupilFrameFormat.GRAY and len(buffer) == width * height:
+        return buffer.reshape(height, width)
+    return buffer
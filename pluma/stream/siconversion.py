@@ -1,5 +1,95 @@
+import numpy as np
 import pandas as pd
 
+from typing import Callable, Mapping, Optional, Sequence, Union
+
+
+class SiConversion:
+    """Base class for conversions that operate on whole arrays of values.
+
+    Conversions can also be called on a single value, so they can be used
+    anywhere a per-element conversion function is expected.
+    """
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        raise NotImplementedError("apply() method is not implemented for the SiConversion base class.")
+
+    def __call__(self, value):
+        result = self.apply(np.asarray(value))
+        return result[()] if result.ndim == 0 else result
+
+
+class AffineConversion(SiConversion):
+    """Converts values with a linear transformation, value * scale + offset.
+
+    Args:
+        scale (float, optional): Multiplicative factor. Defaults to 1.
+        offset (float, optional): Additive offset, applied after scaling. Defaults to 0.
+        dtype (np.dtype, optional): Data type of the converted values. Defaults to np.float64.
+    """
+
+    def __init__(self, scale: float = 1.0, offset: float = 0.0, dtype: np.dtype = np.float64) -> None:
+        self.scale = scale
+        self.offset = offset
+        self.dtype = np.dtype(dtype)
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        # a single output buffer is allocated and both operations run in place
+        result = np.asarray(np.multiply(values, self.scale, dtype=self.dtype))
+        if self.offset != 0:
+            np.add(result, self.offset, out=result)
+        return result
+
+
+class LookupConversion(SiConversion):
+    """Converts discrete values, e.g. register codes, by looking them up in a table.
+
+    Args:
+        table (Union[Mapping, Sequence]): Converted value for each input value. If a sequence\
+            is given, input values are used as positions into the sequence.
+        default (optional): Converted value for inputs missing from the table. Defaults to NaN.
+    """
+
+    def __init__(self, table: Union[Mapping, Sequence], default=np.nan) -> None:
+        if isinstance(table, Mapping):
+            keys = np.asarray(list(table.keys()))
+            values = np.asarray(list(table.values()))
+        else:
+            values = np.asarray(table)
+            keys = np.arange(len(values))
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.values = values[order]
+        self.default = default
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values)
+        if len(self.keys) == 0:
+            return np.full(values.shape, self.default)
+        position = np.clip(np.searchsorted(self.keys, values), 0, len(self.keys) - 1)
+        found = self.keys[position] == values
+        result = self.values[position]
+        if not np.all(found):
+            result = np.where(found, result, self.default)
+        return result
+
+
+class UfuncConversion(SiConversion):
+    """Converts values with a pipeline of vectorized functions, e.g. NumPy ufuncs,
+    applied in order to the whole array of values.
+
+    Args:
+        *functions (Callable[[np.ndarray], np.ndarray]): Functions taking and returning arrays.
+    """
+
+    def __init__(self, *functions: Callable[[np.ndarray], np.ndarray]) -> None:
+        self.functions = functions
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        for function in self.functions:
+            values = function(values)
+        return np.asarray(values)
+
 
 class SiUnitConversion:
     def __init__(self, conversion_function: list = [], units: list = [], attempt_conversion=False) -> None:
@@ -32,7 +122,22 @@ class SiUnitConversion:
             return self._apply_si_conversion(df)
 
     def _apply_si_conversion(self, df):
-        for col, fun in zip(df, self.conversion_function):
-            df[col] = df[col].apply(fun)
+        """Converts each column with its conversion function. SiConversion objects and
+        NumPy ufuncs are applied to the whole column at once, and any other callable
+        is applied to each element. As with zip, functions beyond the last column
+        are ignored."""
+        for i, fun in zip(range(df.shape[1]), self.conversion_function):
+            values = _convert_array(df.iloc[:, i].to_numpy(), fun)
+            if values is None:
+                values = df.iloc[:, i].apply(fun).to_numpy()
+            df.isetitem(i, values)
         df.columns = [f"{col}_{unit}" for col, unit in zip(df.columns, self.units)]
         return df
+
+
+def _convert_array(values: np.ndarray, fun) -> Optional[np.ndarray]:
+    if isinstance(fun, SiConversion):
+        return fun.apply(values)
+    if isinstance(fun, np.ufunc):
+        return fun(values)
+    return None
@@ -20,26 +20,31 @@ class ZmqStream(HarpStream):
     ):
         self.filenames = filenames
         self.dtypes = dtypes
-        super(ZmqStream, self).__init__(eventcode, **kw)
-        self.streamtype = streamtype
         self.clocksource = clocksource
         self.clockunit = clockunit
-
-    def resample(self):
-        pass
+        super(ZmqStream, self).__init__(eventcode, **kw)
+        self.streamtype = streamtype
 
     def convert_to_si(self, data=None):
         pass
 
     def load(self):
         super(ZmqStream, self).load()
-        self.data = pd.DataFrame(np.arange(len(self.data)), index=self.data.index, columns=["Counter"])
-        zmq_data = load_zeromq(self.filenames, self.dtypes, root=self.rootfolder)
-        self.data = self.data.join(zmq_data, on="Counter")
-        if self.clocksource is not None:
+        if self.data is None:
+            return
+
+        # harp events and frame records are aligned by position
+        counter = np.arange(len(self.data))
+        zmq_data = load_zeromq(self.filenames, self.dtypes, root=self.rootfolder, index=self.data.index)
+        if zmq_data is None:
+            self.data = pd.DataFrame(counter, index=self.data.index, columns=["Counter"])
+            return
+        zmq_data.insert(0, "Counter", counter)
+        self.data = zmq_data
+        if self.clocksource is not None and len(self.data) > 0:
             index_name = self.data.index.name
             counter_timedelta = pd.to_timedelta(
-                self.data[self.clocksource] - self.data[self.clocksource][0], self.clockunit
+                self.data[self.clocksource] - self.data[self.clocksource].iloc[0], self.clockunit
             )
             self.data.index = self.data.index[0] + counter_timedelta
             self.data.index.name = index_name
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope="session")
+def synthetic_ecg():
+    """Raw 1 kHz ECG made of a QRS template train at known R-peak times, with
+    baseline wander and white noise, in the layout of the BioData ECG stream."""
+    rng = np.random.default_rng(1)
+    raw_rate, duration = 1000, 300
+    n = raw_rate * duration
+    rr = np.clip(0.8 + 0.1 * np.sin(np.arange(500) / 40) + 0.03 * rng.standard_normal(500), 0.45, 1.5)
+    beats = np.cumsum(rr)
+    beats = beats[beats < duration - 1]
+
+    k = np.arange(-60, 61)
+    template = np.exp(-((k / 15.0) ** 2)) - 0.25 * np.exp(-(((k - 30) / 10.0) ** 2))
+    template += 0.2 * np.exp(-(((k + 50) / 15.0) ** 2))
+    signal = 0.08 * rng.standard_normal(n) + 0.4 * np.sin(2 * np.pi * 0.25 * np.arange(n) / raw_rate)
+    for b in np.round(beats * raw_rate).astype(int):
+        signal[b - 60 : b + 61] += template
+
+    index = pd.Timestamp("2022-01-01") + pd.to_timedelta(np.arange(n) / raw_rate, "s")
+    ecg = pd.DataFrame({"Value0": (signal * 1000 + 2000).astype(np.int16)}, index=index)
+    return ecg, beats
@@ -0,0 +1,175 @@
+import os
+
+import geopandas as gpd
+import mne
+import numpy as np
+import pandas as pd
+import pytest
+from dotmap import DotMap
+from shapely.geometry import Point
+
+from pluma.io.cache import ReaderCache, cached_reader, set_reader_cache
+from pluma.io.columnar import read_columnar, write_columnar
+from pluma.io.eeg import _recover_nepy_attributes
+from pluma.io.path_helper import ComplexPath, RemoteType
+
+
+@pytest.fixture(autouse=True)
+def local_paths(monkeypatch):
+    # ComplexPath formats local paths for Windows, so tests on other platforms use native paths
+    if os.sep == "/":
+        monkeypatch.setattr(
+            ComplexPath,
+            "_parse_remote_type",
+            staticmethod(lambda path: RemoteType.AWS if r"s3://" in path else RemoteType.UNIX),
+        )
+
+
+@pytest.fixture
+def reader_cache(tmp_path):
+    cache = ReaderCache(str(tmp_path / "cache"))
+    set_reader_cache(cache)
+    yield cache
+    set_reader_cache(None)
+
+
+def _frame():
+    index = pd.date_range("2022-01-01", periods=5, freq="s", name="Seconds")
+    return pd.DataFrame(
+        {
+            "Value": np.linspace(0, 1, 5),
+            "Count": np.arange(5, dtype=np.int32),
+            "Label": list("abcde"),
+            "Extra": [{"k": i} for i in range(5)],
+        },
+        index=index,
+    )
+
+
+def _counting_reader(calls):
+    @cached_reader(lambda path, **_: [path])
+    def read(path, scale=1.0):
+        calls.append(path)
+        data = np.loadtxt(path, ndmin=1) * scale
+        return (pd.DataFrame({"Value": data}), data)
+
+    return read
+
+
+def test_columnar_round_trip(tmp_path):
+    frame = _frame()
+    geo = gpd.GeoDataFrame({"Value": [1.0, 2.0]}, geometry=[Point(0, 1), Point(2, 3)], crs="EPSG:4326")
+    value = DotMap(
+        {
+            "frame": frame,
+            "series": frame["Value"].rename("Series"),
+            "geo": geo,
+            "array": np.arange(6.0).reshape(2, 3),
+            "index": pd.Index([3, 1, 2], name="Idx"),
+            "items": ([1, 2, 3], "text", 2.5, None),
+        }
+    )
+    entry = write_columnar(value, str(tmp_path), "data")
+    for memory_map in (True, False):
+        out = read_columnar(entry, str(tmp_path), memory_map=memory_map)
+        assert isinstance(out, DotMap)
+        pd.testing.assert_frame_equal(out.frame, frame, check_freq=False)
+        pd.testing.assert_series_equal(out.series, frame["Value"].rename("Series"), check_freq=False)
+        assert isinstance(out.geo, gpd.GeoDataFrame)
+        assert out.geo.crs == geo.crs
+        assert out.geo.geometry.equals(geo.geometry)
+        np.testing.assert_array_equal(out.array, value.array)
+        pd.testing.assert_index_equal(out.index, value.index)
+        assert out["items"] == ([1, 2, 3], "text", 2.5, None)
+
+
+def test_columnar_reads_are_writable_and_copy_on_write(tmp_path):
+    entry = write_columnar((_frame(), np.arange(4.0)), str(tmp_path), "data")
+    frame, array = read_columnar(entry, str(tmp_path), memory_map=True)
+    array += 1
+    frame.iloc[0, 0] = -1.0
+    frame["Value"].values[1] = -2.0
+
+    frame, array = read_columnar(entry, str(tmp_path), memory_map=True)
+    np.testing.assert_array_equal(array, np.arange(4.0))
+    pd.testing.assert_frame_equal(frame, _frame(), check_freq=False)
+
+
+def test_columnar_raw_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    info = mne.create_info(["Ch0", "Ch1", "STI 014"], 500.0, ["eeg", "eeg", "stim"])
+    data = np.vstack([rng.standard_normal((2, 1000)) * 1e-5, np.repeat(np.arange(10.0), 100)])
+    raw = _recover_nepy_attributes(mne.io.RawArray(data, info, verbose="error"))
+
+    entry = write_columnar(raw, str(tmp_path), "data")
+    out = read_columnar(entry, str(tmp_path), memory_map=True)
+    np.testing.assert_allclose(out.get_data(), data, rtol=1e-6, atol=1e-12)
+    np.testing.assert_array_equal(out.np_markers, raw.np_markers)
+    out.np_time += 1.0
+    out = read_columnar(entry, str(tmp_path), memory_map=True)
+    np.testing.assert_array_equal(out.np_time, raw.np_time)
+
+
+def test_cached_reader_hit_returns_independent_copies(tmp_path, reader_cache):
+    source = tmp_path / "values.txt"
+    source.write_text("1\n2\n3\n")
+    calls = []
+    read = _counting_reader(calls)
+
+    frame, data = read(str(source))
+    hit_frame, hit_data = read(str(source))
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(hit_frame, frame)
+    np.testing.assert_array_equal(hit_data, data)
+
+    hit_data += 10
+    hit_frame.iloc[0, 0] = 0.0
+    frame, data = read(str(source))
+    assert len(calls) == 1
+    np.testing.assert_array_equal(data, [1.0, 2.0, 3.0])
+    assert frame.iloc[0, 0] == 1.0
+
+    read(str(source), scale=2.0)
+    assert len(calls) == 2
+
+
+def test_cached_reader_invalidates_on_source_change(tmp_path, reader_cache):
+    source = tmp_path / "values.txt"
+    source.write_text("1\n2\n3\n")
+    calls = []
+    read = _counting_reader(calls)
+
+    read(str(source))
+    source.write_text("4\n5\n6\n7\n")
+    _, data = read(str(source))
+    assert len(calls) == 2
+    np.testing.assert_array_equal(data, [4.0, 5.0, 6.0, 7.0])
+
+
+def test_cached_reader_without_cache_or_source(tmp_path, reader_cache):
+    calls = []
+    read = _counting_reader(calls)
+    with pytest.raises(OSError):
+        read(str(tmp_path / "missing.txt"))
+
+    set_reader_cache(None)
+    source = tmp_path / "values.txt"
+    source.write_text("1\n")
+    read(str(source))
+    read(str(source))
+    assert len(calls) == 3
+
+
+def test_reader_cache_evicts_least_recently_used(tmp_path, reader_cache):
+    for i, key in enumerate(["a", "b", "c"]):
+        reader_cache.put(key, np.zeros(1000))
+        entry = os.path.join(reader_cache.cachedir, key, "entry.json")
+        os.utime(entry, (1000 + i, 1000 + i))
+    assert reader_cache.get("a")[0]
+
+    entry_size = sum(f.stat().st_size for f in os.scandir(os.path.join(reader_cache.cachedir, "a")))
+    reader_cache.evict(max_bytes=2 * entry_size)
+    assert [reader_cache.get(key)[0] for key in ["a", "b", "c"]] == [True, False, True]
+
+    reader_cache.clear()
+    assert not any(reader_cache.get(key)[0] for key in ["a", "b", "c"])
@@ -0,0 +1,96 @@
+import heartpy as hp
+import numpy as np
+import pandas as pd
+import pytest
+
+from pluma.preprocessing.ecg import find_rpeaks, heartrate_from_ecg, heartrate_from_ecg_chunked
+
+SAMPLE_RATE = 50
+
+
+def _match(peaks: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    """Distance, in samples, from each expected peak to the nearest detected peak."""
+    pos = np.clip(np.searchsorted(peaks, expected), 1, len(peaks) - 1)
+    return np.minimum(np.abs(peaks[pos] - expected), np.abs(peaks[pos - 1] - expected))
+
+
+def _filtered(ecg):
+    return heartrate_from_ecg(ecg, sample_rate=SAMPLE_RATE, detector="numpy")[1].Ecg.values
+
+
+def test_find_rpeaks_matches_ground_truth(synthetic_ecg):
+    ecg, beats = synthetic_ecg
+    working_data, measures = find_rpeaks(_filtered(ecg), SAMPLE_RATE)
+    peaks = np.asarray(working_data["peaklist"])
+    truth = np.round(beats * SAMPLE_RATE).astype(int)
+
+    assert np.mean(_match(peaks, truth) <= 1) >= 0.99
+    assert np.mean(_match(truth, peaks) <= 1) >= 0.98
+    true_bpm = 60 / np.mean(np.diff(beats))
+    assert abs(measures["bpm"] - true_bpm) < 1.0
+
+
+def test_find_rpeaks_agrees_with_heartpy(synthetic_ecg):
+    ecg, _ = synthetic_ecg
+    filtered = _filtered(ecg)
+    working_data, measures = find_rpeaks(filtered, SAMPLE_RATE)
+    hp_working_data, hp_measures = hp.process(filtered, sample_rate=SAMPLE_RATE, bpmmax=200)
+
+    peaks = np.asarray(working_data["peaklist"])
+    hp_peaks = np.asarray(hp_working_data["peaklist"])
+    assert np.mean(_match(peaks, hp_peaks) <= 1) >= 0.98
+    assert abs(measures["bpm"] - hp_measures["bpm"]) < 1.0
+
+
+def test_heartrate_from_ecg_numpy_detector(synthetic_ecg):
+    ecg, beats = synthetic_ecg
+    bpm = heartrate_from_ecg(ecg, sample_rate=SAMPLE_RATE, detector="numpy")[0]
+    hp_bpm = heartrate_from_ecg(ecg, sample_rate=SAMPLE_RATE, detector="heartpy")[0]
+
+    true_bpm = 60 / np.diff(beats)
+    assert abs(bpm.Bpm.median() - np.median(true_bpm)) < 1.0
+    assert abs(bpm.Bpm.median() - hp_bpm.Bpm.median()) < 1.0
+
+
+def test_heartrate_from_ecg_chunked_matches_single_pass(synthetic_ecg):
+    ecg, _ = synthetic_ecg
+    bpm, filtered, working_data, measures = heartrate_from_ecg(
+        ecg, sample_rate=SAMPLE_RATE, detector="numpy", decimation="polyphase"
+    )
+    c_bpm, c_filtered, c_working_data, c_measures = heartrate_from_ecg_chunked(
+        ecg, sample_rate=SAMPLE_RATE, detector="numpy", segment_duration=60
+    )
+
+    np.testing.assert_array_equal(c_working_data["peaklist"], working_data["peaklist"])
+    np.testing.assert_array_equal(c_working_data["binary_peaklist"], working_data["binary_peaklist"])
+    pd.testing.assert_frame_equal(c_bpm, bpm)
+    np.testing.assert_allclose(c_filtered.Ecg.values, filtered.Ecg.values)
+    assert c_measures["bpm"] == pytest.approx(measures["bpm"])
+
+
+def test_heartrate_from_ecg_chunked_heartpy_agrees_with_single_pass(synthetic_ecg):
+    ecg, _ = synthetic_ecg
+    bpm, _, working_data, _ = heartrate_from_ecg(
+        ecg, sample_rate=SAMPLE_RATE, detector="heartpy", decimation="polyphase"
+    )
+    c_bpm, _, c_working_data, _ = heartrate_from_ecg_chunked(
+        ecg, sample_rate=SAMPLE_RATE, detector="heartpy", segment_duration=60
+    )
+
+    peaks = np.asarray(working_data["peaklist"])
+    c_peaks = np.asarray(c_working_data["peaklist"])
+    assert abs(len(c_peaks) - len(peaks)) <= 2
+    assert np.mean(_match(c_peaks, peaks) <= 1) >= 0.99
+    assert abs(c_bpm.Bpm.median() - bpm.Bpm.median()) < 1.0
+
+
+@pytest.mark.parametrize("detector", ["numpy", "heartpy"])
+def test_heartrate_from_ecg_chunked_parallel_matches_serial(synthetic_ecg, detector):
+    ecg, _ = synthetic_ecg
+    kwargs = dict(sample_rate=SAMPLE_RATE, detector=detector, segment_duration=60)
+    bpm, filtered, working_data, _ = heartrate_from_ecg_chunked(ecg, n_jobs=1, **kwargs)
+    p_bpm, p_filtered, p_working_data, _ = heartrate_from_ecg_chunked(ecg, n_jobs=2, **kwargs)
+
+    np.testing.assert_array_equal(p_working_data["peaklist"], working_data["peaklist"])
+    pd.testing.assert_frame_equal(p_bpm, bpm)
+    pd.testing.assert_frame_equal(p_filtered, filtered)
@@ -0,0 +1,38 @@
+import copy
+import pickle
+
+import pandas as pd
+import pytest
+
+from pluma.stream.ecg import EcgData, EcgStream
+
+
+@pytest.fixture
+def ecg_stream(synthetic_ecg):
+    ecg, _ = synthetic_ecg
+    stream = EcgStream(35, device="BioData", streamlabel="ECG", autoload=False)
+    stream.data = EcgData(stream, ecg)
+    stream.set_heartrate_params(detector="numpy")
+    return stream
+
+
+@pytest.mark.parametrize("computed", [False, True])
+@pytest.mark.parametrize("clone", [lambda x: pickle.loads(pickle.dumps(x)), copy.deepcopy])
+def test_ecg_stream_round_trip(ecg_stream, clone, computed):
+    if computed:
+        ecg_stream.data.HeartRate
+    restored = clone(ecg_stream)
+
+    assert isinstance(restored.data, EcgData)
+    assert restored.data._stream is restored
+    assert restored.heartrate_params == ecg_stream.heartrate_params
+    pd.testing.assert_frame_equal(restored.data.Raw, ecg_stream.data.Raw)
+    pd.testing.assert_frame_equal(restored.data.HeartRate, ecg_stream.data.HeartRate)
+    pd.testing.assert_frame_equal(restored.data.Filtered, ecg_stream.data.Filtered)
+
+
+def test_ecg_data_round_trip_keeps_derived_entries_lazy(ecg_stream):
+    restored = pickle.loads(pickle.dumps(ecg_stream.data))
+    assert restored._stream.data is restored
+    assert restored._stream._derived is None
+    assert list(restored.keys()) == ["Raw", "Filtered", "Processed", "HeartRate"]
@@ -0,0 +1,111 @@
+import json
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+
+from pluma.export.ogcapi.features import _export_geoframe_to_ogr, export_geoframe_to_geojson
+
+
+def _frame(has_z: bool, n: int = 2000, seed: int = 0) -> gpd.GeoDataFrame:
+    rng = np.random.default_rng(seed)
+    special = [0.1 + 0.2, 1e-5, 1.5e-7, 1.23e16, 1.000000000000001, 2.999999999999999, 12345.999999999]
+    special += [-9.999999999999999, -0.0, np.nan, 1e-16, 4.5e6, 5e-324, 1e300, -1e-8, 1 / 3]
+    values = np.concatenate(
+        [
+            special,
+            rng.normal(0, 100, n),
+            rng.uniform(-1e-3, 1e-3, n),
+            [round(x, int(k)) for x, k in zip(rng.normal(0, 10, n), rng.integers(0, 12, n))],
+        ]
+    )
+    x, y = np.roll(values, 3), values[::-1]
+    z = np.roll(values, 7) if has_z else None
+    geometry = gpd.points_from_xy(np.nan_to_num(x), np.nan_to_num(y), None if z is None else np.nan_to_num(z))
+    index = pd.date_range("2022-01-01", periods=len(values), freq="1s", name="time")
+    return gpd.GeoDataFrame(
+        {
+            "value": values,
+            "count": np.arange(len(values)),
+            "label": [f"s{i % 7}" for i in range(len(values))],
+        },
+        geometry=geometry,
+        crs=4326,
+        index=index,
+    )
+
+
+def _read_features(path, ndjson: bool) -> list:
+    with open(path) as stream:
+        if ndjson:
+            return [json.loads(line) for line in stream]
+        return json.load(stream)["features"]
+
+
+def test_geojson_layout(tmp_path):
+    index = pd.date_range("2022-01-01", periods=4, freq="1s", name="time")
+    frame = gpd.GeoDataFrame(
+        {"value": [0.1 + 0.2, 2.0, np.nan, 1 / 3], "label": ["a", 'say "hi"', None, "c"]},
+        geometry=gpd.points_from_xy(
+            [-9.123456789012344, 180.0, 38.70111111111111, 1e-9], [38.7, -0.0, 0.5, 12.34567895]
+        ),
+        crs=4326,
+        index=index,
+    )
+    output = tmp_path / "track.json"
+    export_geoframe_to_geojson(frame, str(output))
+    assert output.read_text().splitlines() == [
+        "{",
+        '"type": "FeatureCollection",',
+        '"name": "track",',
+        '"crs": { "type": "name", "properties": { "name": "urn:ogc:def:crs:OGC:1.3:CRS84" } },',
+        '"features": [',
+        '{ "type": "Feature", "properties": { "id": 0, "time": "2022-01-01T00:00:00Z", "value": 0.3, '
+        '"label": "a" }, "geometry": { "type": "Point", "coordinates": [ -9.123456789012344, 38.7 ] } },',
+        '{ "type": "Feature", "properties": { "id": 1, "time": "2022-01-01T00:00:01Z", "value": 2.0, '
+        '"label": "say \\"hi\\"" }, "geometry": { "type": "Point", "coordinates": [ 180.0, -0.0 ] } },',
+        '{ "type": "Feature", "properties": { "id": 2, "time": "2022-01-01T00:00:02Z", "value": null, '
+        '"label": null }, "geometry": { "type": "Point", "coordinates": [ 38.70111111111111, 0.5 ] } },',
+        '{ "type": "Feature", "properties": { "id": 3, "time": "2022-01-01T00:00:03Z", '
+        '"value": 0.333333333333333, "label": "c" }, "geometry": { "type": "Point", '
+        '"coordinates": [ 1e-9, 12.34567895 ] } }',
+        "]",
+        "}",
+    ]
+
+    export_geoframe_to_geojson(frame, str(output), ndjson=True)
+    lines = output.read_text().splitlines()
+    assert len(lines) == 4
+    assert lines[0].endswith('"coordinates": [ -9.1234568, 38.7 ] } }')
+    assert lines[3].endswith('"coordinates": [ 0.0, 12.345679 ] } }')
+
+
+@pytest.mark.parametrize("ndjson", [False, True])
+@pytest.mark.parametrize("has_z", [False, True])
+def test_geojson_matches_ogr_output(tmp_path, has_z, ndjson):
+    frame = _frame(has_z)
+    reference = tmp_path / "reference.json"
+    output = tmp_path / "output.json"
+    _export_geoframe_to_ogr(frame, str(reference), "s", ndjson)
+    export_geoframe_to_geojson(frame, str(output), ndjson=ndjson, chunk_size=1000)
+
+    expected = _read_features(reference, ndjson)
+    features = _read_features(output, ndjson)
+    assert len(features) == len(expected)
+    for name in ("id", "time", "count", "label"):
+        assert [f["properties"][name] for f in features] == [f["properties"][name] for f in expected]
+
+    values = np.array([f["properties"]["value"] for f in features], dtype=np.float64)
+    expected_values = np.array([f["properties"]["value"] for f in expected], dtype=np.float64)
+    np.testing.assert_allclose(values, expected_values, rtol=1e-14, atol=0)
+
+    # coordinates are rounded to the same number of decimals as in the OGR drivers
+    coordinates = np.array([f["geometry"]["coordinates"] for f in features])
+    expected_coordinates = np.array([f["geometry"]["coordinates"] for f in expected])
+    assert coordinates.shape == expected_coordinates.shape
+    precision = [7, 7, 3] if ndjson else [15, 15, 15]
+    for i in range(coordinates.shape[1]):
+        np.testing.assert_allclose(
+            coordinates[:, i], expected_coordinates[:, i], rtol=1e-15, atol=1.01 * 10.0 ** -precision[i]
+        )
@@ -0,0 +1,36 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+import tilemapbase as tmb
+
+from pluma.export import maps
+
+matplotlib.use("Agg")
+
+
+def _walk(n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    heading = np.cumsum(rng.normal(0, 0.01, n))
+    longitude = -9.14 + np.cumsum(1.3e-6 * np.cos(heading))
+    latitude = 38.7 + np.cumsum(1.3e-6 * np.sin(heading))
+    index = pd.date_range("2022-01-01", periods=n, freq="100ms", name="Timestamp")
+    return pd.DataFrame({"Longitude": longitude, "Latitude": latitude}, index=index)
+
+
+def test_project_lonlat_matches_tilemapbase():
+    path = _walk(1000)
+    x, y = maps.project_lonlat(path.Longitude.values, path.Latitude.values)
+    expected = np.array([tmb.project(lon, lat) for lon, lat in zip(path.Longitude, path.Latitude)])
+    np.testing.assert_allclose(x, expected[:, 0], rtol=0, atol=1e-15)
+    np.testing.assert_allclose(y, expected[:, 1], rtol=0, atol=1e-15)
+
+
+def test_showmap_decimates_default_time_colors(monkeypatch):
+    # tiles are not downloaded in tests
+    monkeypatch.setattr(tmb.Plotter, "plot", lambda self, ax, **kwargs: None)
+    path = _walk()
+    fig = maps.showmap(path, decimate=True)
+    scatter = fig.axes[0].collections[0]
+    n_plotted = len(scatter.get_offsets())
+    assert 0 < n_plotted < len(path)
+    assert len(scatter.get_array()) == n_plotted
@@ -0,0 +1,57 @@
+import json
+import urllib.error
+import urllib.request
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+
+from pluma.export.ogcapi.server import FeatureStore, serve_features_in_background
+
+
+@pytest.fixture
+def server():
+    index = pd.date_range("2022-01-01", periods=25, freq="1s", name="time")
+    frame = gpd.GeoDataFrame(
+        {"value": np.arange(25.0)},
+        geometry=gpd.points_from_xy(np.linspace(-9.2, -9.1, 25), np.linspace(38.7, 38.8, 25)),
+        crs=4326,
+        index=index,
+    )
+    store = FeatureStore()
+    store.add_collection("track", frame)
+    store.add_collection("empty", frame.iloc[:0])
+    server = serve_features_in_background(store)
+    yield "http://%s:%d" % server.server_address[:2]
+    server.shutdown()
+
+
+def _get(url: str) -> dict:
+    with urllib.request.urlopen(url) as response:
+        return json.loads(response.read())
+
+
+def test_items_pages_follow_next_links(server):
+    url, ids = f"{server}/collections/track/items?limit=10", []
+    while url is not None:
+        page = _get(url)
+        ids += [feature["properties"]["id"] for feature in page["features"]]
+        url = next((link["href"] for link in page["links"] if link["rel"] == "next"), None)
+        url = url if url is None or url.startswith("http") else server + url
+    assert ids == list(range(25))
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_items_rejects_limit_below_one(server, limit):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        _get(f"{server}/collections/track/items?limit={limit}")
+    assert error.value.code == 400
+
+
+def test_empty_collection_extent_is_valid_json(server):
+    with urllib.request.urlopen(f"{server}/collections/empty") as response:
+        collection = json.loads(response.read(), parse_constant=pytest.fail)
+    assert "spatial" not in collection["extent"]
+    assert collection["extent"]["temporal"]["interval"] == [[None, None]]
+    assert "spatial" in _get(f"{server}/collections/track")["extent"]
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from pluma.stream.siconversion import AffineConversion, LookupConversion, SiUnitConversion
+
+
+def test_apply_si_conversion_pairs_functions_with_columns():
+    df = pd.DataFrame({"A": [1, 2], "B": [0, 1]})
+    conversion = SiUnitConversion(
+        conversion_function=[AffineConversion(scale=0.5), LookupConversion([10.0, 20.0]), np.sqrt],
+        units=["m", "s"],
+    )
+    out = conversion._apply_si_conversion(df)
+
+    assert list(out.columns) == ["A_m", "B_s"]
+    np.testing.assert_array_equal(out["A_m"], [0.5, 1.0])
+    np.testing.assert_array_equal(out["B_s"], [10.0, 20.0])
+
+
+def test_apply_si_conversion_falls_back_to_elementwise_functions():
+    df = pd.DataFrame({"A": [1, 4]})
+    out = SiUnitConversion(conversion_function=[lambda x: x * 2], units=["V"])._apply_si_conversion(df)
+    np.testing.assert_array_equal(out["A_V"], [2, 8])